@@ -0,0 +1,182 @@
+# Compares the fused payload visitor with the previous multi-pass walks on synthetic
+# CycloneDX and SARIF documents.
+#   cd apps/api && PYTHONPATH=src python benchmarks/artifact_payload_benchmark.py
+
+import argparse
+import io
+import json
+import timeit
+import zipfile
+from typing import Any
+
+from app.services import artifact_summary as current
+from app.services.artifact_summary import ArchiveLimits, ArtifactSummaryBuilder
+
+
+def _iter_pairs(payload: Any):
+    if isinstance(payload, dict):
+        for key, value in payload.items():
+            yield str(key), value
+            yield from _iter_pairs(value)
+    elif isinstance(payload, list):
+        for item in payload:
+            yield from _iter_pairs(item)
+
+
+def _collect_json_findings(payload: Any) -> list[str]:
+    findings: list[str] = []
+    if isinstance(payload, dict):
+        for key in ("severity", "level", "issue_severity", "Severity", "riskdesc", "risk"):
+            if key in payload and isinstance(payload[key], str):
+                findings.append(payload[key])
+        for key in ("results", "vulnerabilities", "findings", "alerts", "site"):
+            value = payload.get(key)
+            if isinstance(value, list):
+                for item in value:
+                    findings.extend(_collect_json_findings(item))
+        if "Results" in payload and isinstance(payload["Results"], list):
+            for result in payload["Results"]:
+                if isinstance(result, dict):
+                    vulns = result.get("Vulnerabilities", [])
+                    if isinstance(vulns, list):
+                        for vuln in vulns:
+                            findings.extend(_collect_json_findings(vuln))
+        if "dependencies" in payload and isinstance(payload["dependencies"], list):
+            for dep in payload["dependencies"]:
+                if isinstance(dep, dict):
+                    for vuln in dep.get("vulns", []):
+                        findings.extend(_collect_json_findings(vuln))
+                    for vuln in dep.get("vulnerabilities", []):
+                        findings.extend(_collect_json_findings(vuln))
+    elif isinstance(payload, list):
+        for item in payload:
+            findings.extend(_collect_json_findings(item))
+    return findings
+
+
+def _extract_sarif_levels(payload: dict[str, Any]) -> list[str]:
+    findings: list[str] = []
+    for run in payload.get("runs", []):
+        if isinstance(run, dict) and isinstance(run.get("results", []), list):
+            for result in run.get("results", []):
+                if isinstance(result, dict) and isinstance(result.get("level"), str):
+                    findings.append(result["level"])
+    return findings
+
+
+def legacy_analyze(member: str, artifact_name: str, payload: Any) -> tuple:
+    # The pre-fusion pipeline: SBOM probe, a full _iter_pairs walk for signals, then a second
+    # walk for findings.
+    sbom = current._is_sbom_file_name(member) or isinstance(payload, dict) and "bomFormat" in payload
+    signals: dict[str, Any] = {}
+    for key, value in _iter_pairs(payload):
+        current._record_signal(signals, key, value)
+    tool = current.tool_for_name(current._sarif_driver_name(payload))
+    tool = tool or current._tool_from_names(artifact_name, member)
+    findings: list[str] = []
+    if tool:
+        if member.endswith(".sarif"):
+            findings = _extract_sarif_levels(payload)
+        else:
+            findings = _collect_json_findings(payload)
+    return sbom, signals, tool, sorted(findings)
+
+
+def fused_analyze(member: str, artifact_name: str, payload: Any) -> tuple:
+    tool = current.tool_for_name(current._sarif_driver_name(payload))
+    tool = tool or current._tool_from_names(artifact_name, member)
+    analyzer = current.PayloadAnalyzer(sarif=member.endswith(".sarif"), collect_findings=bool(tool))
+    analyzer.visit(payload)
+    sbom = current._is_sbom_file_name(member) or analyzer.bom_format
+    return sbom, analyzer.signals, tool, sorted(analyzer.findings)
+
+
+def cyclonedx_sbom(components: int) -> dict[str, Any]:
+    return {
+        "bomFormat": "CycloneDX",
+        "specVersion": "1.5",
+        "metadata": {"component": {"name": "dashboard", "version": "1.0.0", "digest": "sha256:abc"}},
+        "components": [
+            {
+                "type": "library",
+                "name": f"package-{index}",
+                "version": f"{index % 7}.{index % 13}.{index % 5}",
+                "purl": f"pkg:pypi/package-{index}@1.0.0",
+                "licenses": [{"license": {"id": "MIT", "url": "https://opensource.org/licenses/MIT"}}],
+                "hashes": [{"alg": "SHA-256", "content": f"{index:064x}"}],
+                "properties": [{"name": "source", "value": "requirements.txt"}],
+            }
+            for index in range(components)
+        ],
+    }
+
+
+def semgrep_sarif(results: int) -> dict[str, Any]:
+    return {
+        "version": "2.1.0",
+        "runs": [
+            {
+                "tool": {"driver": {"name": "Semgrep", "rules": [{"id": f"rule-{i}"} for i in range(50)]}},
+                "results": [
+                    {
+                        "ruleId": f"rule-{index % 50}",
+                        "level": ("error", "warning", "note")[index % 3],
+                        "message": {"text": "Detected a possible issue in user input handling."},
+                        "locations": [
+                            {
+                                "physicalLocation": {
+                                    "artifactLocation": {"uri": f"src/module_{index % 40}.py"},
+                                    "region": {"startLine": index % 500 + 1, "startColumn": 5},
+                                }
+                            }
+                        ],
+                    }
+                    for index in range(results)
+                ],
+            }
+        ],
+    }
+
+
+def _zip(member: str, payload: Any) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(member, json.dumps(payload))
+    return buffer.getvalue()
+
+
+def _best(stmt, repeat: int) -> float:
+    return min(timeit.repeat(stmt, number=1, repeat=repeat))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Artifact payload analysis benchmark")
+    parser.add_argument("--components", type=int, default=5000)
+    parser.add_argument("--results", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    fixtures = (
+        ("sbom", "bom.cyclonedx.json", cyclonedx_sbom(args.components)),
+        ("semgrep-scan", "semgrep.sarif", semgrep_sarif(args.results)),
+    )
+    print(f"{'fixture':<22}{'legacy ms':>12}{'fused ms':>12}{'speedup':>10}{'stream ms':>12}")
+    for artifact_name, member, payload in fixtures:
+        assert legacy_analyze(member, artifact_name, payload) == fused_analyze(member, artifact_name, payload)
+        legacy = _best(lambda: legacy_analyze(member, artifact_name, payload), args.repeat)
+        fused = _best(lambda: fused_analyze(member, artifact_name, payload), args.repeat)
+        archive = _zip(member, payload)
+
+        def _stream():
+            builder = ArtifactSummaryBuilder(ArchiveLimits(stream_member_bytes=0))
+            builder.add_archive(artifact_name, io.BytesIO(archive))
+
+        streamed = _best(_stream, args.repeat)
+        print(
+            f"{member:<22}{legacy * 1000:>12.1f}{fused * 1000:>12.1f}"
+            f"{legacy / fused:>9.2f}x{streamed * 1000:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
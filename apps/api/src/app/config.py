@@ -19,6 +19,16 @@ def _env_int(name: str, default: int) -> int:
         return default
 
 
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
 def apply_config(app):
     data_dir = Path(app.root_path).parents[1] / "data"
     app.config.setdefault("GITHUB_API_BASE", "https://api.github.com")
@@ -26,6 +36,7 @@ def apply_config(app):
     app.config.setdefault("GITHUB_REPO", os.getenv("GITHUB_REPO", ""))
     app.config.setdefault("GITHUB_TOKEN", os.getenv("GITHUB_TOKEN", ""))
     app.config.setdefault("SYNC_TOKEN", os.getenv("SYNC_TOKEN", ""))
+    app.config.setdefault("GITHUB_WEBHOOK_SECRET", os.getenv("GITHUB_WEBHOOK_SECRET", ""))
     app.config.setdefault(
         "RUNS_STORAGE_PATH",
         os.getenv("RUNS_STORAGE_PATH", str(data_dir / "workflow_runs.db")),
@@ -36,4 +47,71 @@ def apply_config(app):
     )
     app.config.setdefault("POLLING_ENABLED", _env_bool("POLLING_ENABLED", True))
     app.config.setdefault("POLLING_INTERVAL_SECONDS", max(30, _env_int("POLLING_INTERVAL_SECONDS", 300)))
+    app.config.setdefault(
+        "POLLING_FAST_INTERVAL_SECONDS",
+        max(10, _env_int("POLLING_FAST_INTERVAL_SECONDS", 30)),
+    )
+    app.config.setdefault(
+        "POLLING_MAX_INTERVAL_SECONDS",
+        max(30, _env_int("POLLING_MAX_INTERVAL_SECONDS", 3600)),
+    )
+    app.config.setdefault(
+        "POLLING_IDLE_CYCLES_BEFORE_BACKOFF",
+        max(1, _env_int("POLLING_IDLE_CYCLES_BEFORE_BACKOFF", 3)),
+    )
+    app.config.setdefault("POLLING_JITTER_RATIO", max(0.0, min(_env_float("POLLING_JITTER_RATIO", 0.1), 0.5)))
+    app.config.setdefault(
+        "POLLING_RECONCILE_INTERVAL_SECONDS",
+        max(60, _env_int("POLLING_RECONCILE_INTERVAL_SECONDS", 1800)),
+    )
     app.config.setdefault("POLLING_PER_PAGE", max(1, min(_env_int("POLLING_PER_PAGE", 30), 100)))
+    app.config.setdefault(
+        "SYNC_ARTIFACT_CONCURRENCY",
+        max(1, min(_env_int("SYNC_ARTIFACT_CONCURRENCY", 4), 16)),
+    )
+    app.config.setdefault("GITHUB_HTTP_POOL_SIZE", max(1, min(_env_int("GITHUB_HTTP_POOL_SIZE", 8), 64)))
+    app.config.setdefault(
+        "GITHUB_HTTP_TIMEOUT_SECONDS",
+        max(1, _env_int("GITHUB_HTTP_TIMEOUT_SECONDS", 20)),
+    )
+    app.config.setdefault("GITHUB_RATE_LIMIT_RESERVE", max(0, _env_int("GITHUB_RATE_LIMIT_RESERVE", 100)))
+    app.config.setdefault(
+        "HTTP_VALIDATOR_CACHE_MAX_ENTRIES",
+        max(1, _env_int("HTTP_VALIDATOR_CACHE_MAX_ENTRIES", 500)),
+    )
+    app.config.setdefault("SYNC_MAX_PAGES", max(1, min(_env_int("SYNC_MAX_PAGES", 10), 100)))
+    app.config.setdefault("SYNC_LEASE_TTL_SECONDS", max(10, _env_int("SYNC_LEASE_TTL_SECONDS", 120)))
+    app.config.setdefault(
+        "ARTIFACT_MAX_ARCHIVE_BYTES",
+        max(1, _env_int("ARTIFACT_MAX_ARCHIVE_BYTES", 256 * 1024 * 1024)),
+    )
+    app.config.setdefault(
+        "ARTIFACT_MAX_MEMBER_BYTES",
+        max(1, _env_int("ARTIFACT_MAX_MEMBER_BYTES", 64 * 1024 * 1024)),
+    )
+    app.config.setdefault(
+        "ARTIFACT_MAX_COMPRESSION_RATIO",
+        max(1.0, _env_float("ARTIFACT_MAX_COMPRESSION_RATIO", 100.0)),
+    )
+    app.config.setdefault(
+        "ARTIFACT_SPOOL_MEMORY_BYTES",
+        max(0, _env_int("ARTIFACT_SPOOL_MEMORY_BYTES", 8 * 1024 * 1024)),
+    )
+    app.config.setdefault(
+        "ARTIFACT_STREAM_MEMBER_BYTES",
+        max(0, _env_int("ARTIFACT_STREAM_MEMBER_BYTES", 4 * 1024 * 1024)),
+    )
+    app.config.setdefault(
+        "ARTIFACT_PARSE_WORKERS",
+        max(0, min(_env_int("ARTIFACT_PARSE_WORKERS", 0), os.cpu_count() or 1)),
+    )
+    app.config.setdefault(
+        "ARTIFACT_PARSE_MIN_ARCHIVE_BYTES",
+        max(0, _env_int("ARTIFACT_PARSE_MIN_ARCHIVE_BYTES", 1024 * 1024)),
+    )
+    app.config.setdefault("SQLITE_CACHE_SIZE_KB", max(0, _env_int("SQLITE_CACHE_SIZE_KB", 16384)))
+    app.config.setdefault(
+        "SQLITE_MMAP_SIZE_BYTES",
+        max(0, _env_int("SQLITE_MMAP_SIZE_BYTES", 64 * 1024 * 1024)),
+    )
+    app.config.setdefault("SQLITE_POOL_SIZE", max(0, _env_int("SQLITE_POOL_SIZE", 8)))
@@ -1,5 +1,5 @@
 from dataclasses import asdict, dataclass, field
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from typing import Any
 
 
@@ -14,6 +14,53 @@ def _duration_seconds(started_at: str, completed_at: str) -> int | None:
     return int((completed - started).total_seconds())
 
 
+def extract_run_date(run: dict[str, Any]) -> date | None:
+    for key in ("started_at", "synced_at", "completed_at"):
+        value = run.get(key)
+        if not isinstance(value, str) or len(value) < 10:
+            continue
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).date()
+        except ValueError:
+            try:
+                return date.fromisoformat(value[:10])
+            except ValueError:
+                continue
+    return None
+
+
+def _epoch_seconds(value: Any) -> int | None:
+    if not isinstance(value, str) or not value.strip():
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def derive_run_timestamps(started_at: Any, completed_at: Any, synced_at: Any) -> dict[str, int | None]:
+    started_epoch = _epoch_seconds(started_at)
+    completed_epoch = _epoch_seconds(completed_at)
+    synced_epoch = _epoch_seconds(synced_at)
+    run_epoch = next(
+        (value for value in (started_epoch, completed_epoch, synced_epoch) if value is not None),
+        None,
+    )
+    run_date = extract_run_date(
+        {"started_at": started_at, "completed_at": completed_at, "synced_at": synced_at}
+    )
+    return {
+        "started_epoch": started_epoch,
+        "completed_epoch": completed_epoch,
+        "synced_epoch": synced_epoch,
+        "run_epoch": run_epoch,
+        "run_day": run_date.toordinal() if run_date else None,
+    }
+
+
 @dataclass
 class WorkflowRun:
     id: int
@@ -28,6 +75,16 @@ class WorkflowRun:
     html_url: str
     summary_json: dict[str, Any] = field(default_factory=dict)
     synced_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    # Parsed once here so the read path never re-parses ISO strings.
+    started_epoch: int | None = None
+    completed_epoch: int | None = None
+    synced_epoch: int | None = None
+    run_epoch: int | None = None
+    run_day: int | None = None
+
+    def __post_init__(self) -> None:
+        for key, value in derive_run_timestamps(self.started_at, self.completed_at, self.synced_at).items():
+            setattr(self, key, value)
 
     @classmethod
     def from_github_run(cls, run: dict[str, Any]) -> "WorkflowRun":
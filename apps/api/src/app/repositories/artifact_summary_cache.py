@@ -0,0 +1,43 @@
+import json
+from datetime import datetime, timezone
+from typing import Any
+
+from .sqlite_connection import SQLiteConnectionManager
+
+
+class ArtifactSummaryCache:
+    def __init__(self, connections: SQLiteConnectionManager):
+        self.connections = connections
+
+    def get(self, run_id: int, fingerprint: str) -> dict[str, Any] | None:
+        with self.connections.connection() as conn:
+            row = conn.execute(
+                "SELECT summary_json FROM artifact_summary_cache WHERE run_id = ? AND fingerprint = ?",
+                (run_id, fingerprint),
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            summary = json.loads(row["summary_json"])
+        except json.JSONDecodeError:
+            return None
+        return summary if isinstance(summary, dict) else None
+
+    def put(self, run_id: int, fingerprint: str, summary: dict[str, Any]) -> None:
+        with self.connections.connection() as conn:
+            conn.execute(
+                """
+                INSERT INTO artifact_summary_cache (run_id, fingerprint, summary_json, updated_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(run_id) DO UPDATE SET
+                    fingerprint = excluded.fingerprint,
+                    summary_json = excluded.summary_json,
+                    updated_at = excluded.updated_at
+                """,
+                (
+                    run_id,
+                    fingerprint,
+                    json.dumps(summary, ensure_ascii=False, sort_keys=True),
+                    datetime.now(timezone.utc).isoformat(),
+                ),
+            )
@@ -0,0 +1,46 @@
+from datetime import datetime, timezone
+from typing import Any
+
+from .sqlite_connection import SQLiteConnectionManager
+
+
+class HttpValidatorCache:
+    def __init__(self, connections: SQLiteConnectionManager, max_entries: int = 500):
+        self.connections = connections
+        self.max_entries = max(1, max_entries)
+
+    def get(self, url: str) -> dict[str, Any] | None:
+        with self.connections.connection() as conn:
+            row = conn.execute(
+                "SELECT etag, last_modified, body FROM http_validators WHERE url = ?",
+                (url,),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def put(self, url: str, etag: str, last_modified: str, body: str) -> None:
+        with self.connections.connection() as conn:
+            conn.execute(
+                """
+                INSERT INTO http_validators (url, etag, last_modified, body, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    body = excluded.body,
+                    updated_at = excluded.updated_at
+                """,
+                (url, etag, last_modified, body, datetime.now(timezone.utc).isoformat()),
+            )
+            # Every `created>=` cursor and every run's artifact listing is a distinct URL, so only
+            # the most recently written entries are kept.
+            conn.execute(
+                """
+                DELETE FROM http_validators
+                WHERE updated_at < (
+                    SELECT updated_at FROM http_validators
+                    ORDER BY updated_at DESC
+                    LIMIT 1 OFFSET ?
+                )
+                """,
+                (self.max_entries - 1,),
+            )
@@ -0,0 +1,175 @@
+import re
+from collections.abc import Callable, Iterator
+from json import JSONDecodeError
+from json.decoder import scanstring
+from typing import Any
+
+START_MAP = "start_map"
+END_MAP = "end_map"
+START_ARRAY = "start_array"
+END_ARRAY = "end_array"
+MAP_KEY = "map_key"
+VALUE = "value"
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_RE = re.compile(r"(-?(?:0|[1-9]\d*))(\.\d+)?([eE][-+]?\d+)?")
+# Same literals json.loads accepts, longest spelling first so "-Infinity" wins over a number.
+_CONSTANTS = (
+    ("-Infinity", float("-inf")),
+    ("Infinity", float("inf")),
+    ("NaN", float("nan")),
+    ("true", True),
+    ("false", False),
+    ("null", None),
+)
+
+
+class JSONStreamError(ValueError):
+    pass
+
+
+class _Tokenizer:
+    def __init__(self, read: Callable[[int], str], chunk_size: int):
+        self.read = read
+        self.chunk_size = max(1, chunk_size)
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        # Read at least as much as is still buffered so retries on a long token stay linear.
+        chunk = self.read(max(self.chunk_size, len(self.buf) - self.pos))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _peek(self) -> str:
+        while True:
+            buf = self.buf
+            pos = self.pos
+            length = len(buf)
+            while pos < length and buf[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < length:
+                return buf[pos]
+            if not self._fill():
+                return ""
+
+    def _error(self, message: str) -> JSONStreamError:
+        return JSONStreamError(f"{message} at buffer offset {self.pos}")
+
+    def _string(self) -> str:
+        while True:
+            try:
+                value, end = scanstring(self.buf, self.pos + 1, True)
+            except JSONDecodeError as exc:
+                if self._fill():
+                    continue
+                raise self._error("Invalid string") from exc
+            self.pos = end
+            return value
+
+    def _scalar(self) -> Any:
+        while True:
+            buf = self.buf
+            pos = self.pos
+            for literal, value in _CONSTANTS:
+                if buf.startswith(literal, pos):
+                    self.pos = pos + len(literal)
+                    return value
+            match = _NUMBER_RE.match(buf, pos)
+            # A number cut at the buffer edge may continue with a fraction or exponent ("2" + "e-5").
+            needs_more = not self.eof and (
+                match is None and len(buf) - pos < len("-Infinity")
+                or match is not None and len(buf) - match.end() < len("e-1")
+            )
+            if needs_more:
+                self._fill()
+                continue
+            if match is None:
+                raise self._error("Expecting value")
+            integer, fraction, exponent = match.groups()
+            self.pos = match.end()
+            if fraction or exponent:
+                return float(integer + (fraction or "") + (exponent or ""))
+            return int(integer)
+
+    def events(self) -> Iterator[tuple[str, Any]]:
+        stack: list[str] = []
+        expect = "value"
+        while True:
+            char = self._peek()
+            if expect == "done":
+                if char:
+                    raise self._error("Extra data")
+                return
+            if not char:
+                raise self._error("Unexpected end of document")
+
+            if expect in {"value", "value_or_end"}:
+                if char == "]" and expect == "value_or_end":
+                    self.pos += 1
+                    stack.pop()
+                    yield END_ARRAY, None
+                elif char == "{":
+                    self.pos += 1
+                    stack.append("map")
+                    yield START_MAP, None
+                    expect = "key_or_end"
+                    continue
+                elif char == "[":
+                    self.pos += 1
+                    stack.append("array")
+                    yield START_ARRAY, None
+                    expect = "value_or_end"
+                    continue
+                elif char == '"':
+                    yield VALUE, self._string()
+                else:
+                    yield VALUE, self._scalar()
+            elif expect in {"key", "key_or_end"}:
+                if char == "}" and expect == "key_or_end":
+                    self.pos += 1
+                    stack.pop()
+                    yield END_MAP, None
+                elif char == '"':
+                    yield MAP_KEY, self._string()
+                    expect = "colon"
+                    continue
+                else:
+                    raise self._error("Expecting property name enclosed in double quotes")
+            elif expect == "colon":
+                if char != ":":
+                    raise self._error("Expecting ':' delimiter")
+                self.pos += 1
+                expect = "value"
+                continue
+            else:
+                container = stack[-1]
+                if char == ",":
+                    self.pos += 1
+                    expect = "key" if container == "map" else "value"
+                    continue
+                if char == "}" and container == "map":
+                    self.pos += 1
+                    stack.pop()
+                    yield END_MAP, None
+                elif char == "]" and container == "array":
+                    self.pos += 1
+                    stack.pop()
+                    yield END_ARRAY, None
+                else:
+                    raise self._error("Expecting ',' delimiter")
+            expect = "comma_or_end" if stack else "done"
+
+
+def iter_json_events(read: Callable[[int], str], chunk_size: int = 64 * 1024) -> Iterator[tuple[str, Any]]:
+    # Yields (event, value) pairs for one JSON document read through `read`, holding only the
+    # container stack and the current token in memory. Malformed input raises JSONStreamError.
+    return _Tokenizer(read, chunk_size).events()
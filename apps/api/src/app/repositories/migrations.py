@@ -0,0 +1,370 @@
+import json
+import sqlite3
+from collections.abc import Callable
+from datetime import date
+from typing import Any
+
+from ..models.workflow_run import derive_run_timestamps
+
+TIMESTAMP_COLUMNS = ("started_epoch", "completed_epoch", "synced_epoch", "run_epoch", "run_day")
+
+INSERT_FINDING_SQL = """
+INSERT INTO run_findings (run_id, tool, severity, count) VALUES (?, ?, ?, ?)
+ON CONFLICT(run_id, tool, severity) DO UPDATE SET count = excluded.count
+"""
+
+ADD_ROLLUP_SQL = """
+INSERT INTO daily_security_rollup (day, severity, count) VALUES (?, ?, ?)
+ON CONFLICT(day, severity) DO UPDATE SET count = daily_security_rollup.count + excluded.count
+"""
+
+INSERT_SUPPLY_CHAIN_FLAG_SQL = "INSERT OR IGNORE INTO run_supply_chain_flags (flag, run_id) VALUES (?, ?)"
+
+# Must match the partial index predicate exactly for SQLite to use the index.
+PENDING_SUMMARY_SQL = "json_extract(summary_json, '$.status') = 'pending'"
+SKIPPED_ARTIFACTS_SQL = "json_type(summary_json, '$.skipped') IS NOT NULL"
+ACTIVE_RUN_STATUSES = ("queued", "in_progress", "waiting", "requested", "pending")
+ACTIVE_RUNS_SQL = f"conclusion IN ({', '.join(repr(status) for status in ACTIVE_RUN_STATUSES)})"
+
+
+def finding_rows(run_id: int, summary_json: Any) -> list[tuple[int, str, str, int]]:
+    if not isinstance(summary_json, dict):
+        return []
+    tools = summary_json.get("tools", {})
+    if not isinstance(tools, dict):
+        return []
+    rows: list[tuple[int, str, str, int]] = []
+    for tool, severities in tools.items():
+        if not isinstance(severities, dict):
+            continue
+        for severity, count in severities.items():
+            if isinstance(count, bool) or not isinstance(count, (int, float)):
+                continue
+            if int(count) > 0:
+                rows.append((run_id, str(tool), str(severity), int(count)))
+    return rows
+
+
+def supply_chain_flag_rows(run_id: int, summary_json: Any) -> list[tuple[str, int]]:
+    # Same truthiness json_extract had in a WHERE clause: true or a non-zero number.
+    if not isinstance(summary_json, dict):
+        return []
+    supply_chain = summary_json.get("supply_chain", {})
+    if not isinstance(supply_chain, dict):
+        return []
+    return [
+        (str(flag), run_id)
+        for flag, value in supply_chain.items()
+        if isinstance(value, (bool, int, float)) and value
+    ]
+
+
+def day_key(run_day: int | None) -> str | None:
+    return date.fromordinal(run_day).isoformat() if run_day else None
+
+
+def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)).fetchone()
+    return row is not None
+
+
+# Databases created before versioning (user_version 0) may already contain any
+# subset of these objects, so every step is written to be idempotent.
+def _create_workflow_runs(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS workflow_runs (
+            run_id INTEGER PRIMARY KEY,
+            seq INTEGER NOT NULL,
+            workflow_name TEXT NOT NULL,
+            category TEXT NOT NULL,
+            conclusion TEXT NOT NULL,
+            branch TEXT NOT NULL,
+            commit_sha TEXT NOT NULL,
+            started_at TEXT NOT NULL,
+            completed_at TEXT NOT NULL,
+            duration INTEGER,
+            html_url TEXT NOT NULL,
+            summary_json TEXT NOT NULL,
+            synced_at TEXT NOT NULL
+        )
+        """
+    )
+
+
+def _add_run_timestamps(conn: sqlite3.Connection) -> None:
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(workflow_runs)")}
+    missing = [key for key in TIMESTAMP_COLUMNS if key not in columns]
+    if not missing:
+        return
+    for key in missing:
+        conn.execute(f"ALTER TABLE workflow_runs ADD COLUMN {key} INTEGER")
+    rows = conn.execute("SELECT run_id, started_at, completed_at, synced_at FROM workflow_runs").fetchall()
+    assignments = ", ".join(f"{key} = ?" for key in TIMESTAMP_COLUMNS)
+    for run_id, started_at, completed_at, synced_at in rows:
+        timestamps = derive_run_timestamps(started_at, completed_at, synced_at)
+        conn.execute(
+            f"UPDATE workflow_runs SET {assignments} WHERE run_id = ?",
+            (*(timestamps[key] for key in TIMESTAMP_COLUMNS), run_id),
+        )
+
+
+def _create_run_indexes(conn: sqlite3.Connection) -> None:
+    for obsolete in (
+        "idx_workflow_runs_seq",
+        "idx_workflow_runs_category_seq",
+        "idx_workflow_runs_branch_seq",
+        "idx_workflow_runs_started",
+        "idx_workflow_runs_category_started",
+        "idx_workflow_runs_branch_started",
+    ):
+        conn.execute(f"DROP INDEX IF EXISTS {obsolete}")
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_workflow_runs_started_epoch
+        ON workflow_runs (started_epoch, run_id)
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_workflow_runs_category_started_epoch
+        ON workflow_runs (category, started_epoch, run_id)
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_workflow_runs_branch_started_epoch
+        ON workflow_runs (branch COLLATE NOCASE, started_epoch, run_id)
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_workflow_runs_category_run_epoch
+        ON workflow_runs (category, run_epoch, run_id)
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_workflow_runs_run_day
+        ON workflow_runs (run_day)
+        """
+    )
+
+
+def _create_run_findings(conn: sqlite3.Connection) -> None:
+    if _table_exists(conn, "run_findings"):
+        return
+    conn.execute(
+        """
+        CREATE TABLE run_findings (
+            run_id INTEGER NOT NULL,
+            tool TEXT NOT NULL,
+            severity TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (run_id, tool, severity)
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_run_findings_tool_severity
+        ON run_findings (tool, severity, count)
+        """
+    )
+    for run_id, raw_summary in conn.execute("SELECT run_id, summary_json FROM workflow_runs").fetchall():
+        try:
+            summary_json = json.loads(raw_summary)
+        except json.JSONDecodeError:
+            continue
+        conn.executemany(INSERT_FINDING_SQL, finding_rows(run_id, summary_json))
+
+
+def _create_daily_security_rollup(conn: sqlite3.Connection) -> None:
+    if _table_exists(conn, "daily_security_rollup"):
+        return
+    conn.execute(
+        """
+        CREATE TABLE daily_security_rollup (
+            day TEXT NOT NULL,
+            severity TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (day, severity)
+        ) WITHOUT ROWID
+        """
+    )
+    rows = conn.execute(
+        """
+        SELECT r.run_day, f.severity, SUM(f.count) AS total
+        FROM run_findings AS f
+        JOIN workflow_runs AS r ON r.run_id = f.run_id
+        WHERE r.run_day IS NOT NULL
+        GROUP BY f.run_id, f.severity
+        """
+    ).fetchall()
+    for run_day, severity, total in rows:
+        conn.execute(ADD_ROLLUP_SQL, (day_key(run_day), severity, total))
+
+
+def _create_artifact_summary_cache(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS artifact_summary_cache (
+            run_id INTEGER PRIMARY KEY,
+            fingerprint TEXT NOT NULL,
+            summary_json TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+        """
+    )
+
+
+def _create_http_validators(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS http_validators (
+            url TEXT PRIMARY KEY,
+            etag TEXT NOT NULL,
+            last_modified TEXT NOT NULL,
+            body TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+        """
+    )
+
+
+def _create_sync_state(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS sync_state (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        ) WITHOUT ROWID
+        """
+    )
+
+
+def _create_pending_summary_index(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        f"""
+        CREATE INDEX IF NOT EXISTS idx_workflow_runs_pending_summary
+        ON workflow_runs(run_id) WHERE {PENDING_SUMMARY_SQL}
+        """
+    )
+
+
+def _create_sync_lease(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS sync_lease (
+            name TEXT PRIMARY KEY,
+            owner TEXT NOT NULL DEFAULT '',
+            mode TEXT NOT NULL DEFAULT '',
+            expires_at REAL NOT NULL DEFAULT 0,
+            generation INTEGER NOT NULL DEFAULT 0,
+            result_mode TEXT NOT NULL DEFAULT '',
+            result_json TEXT,
+            finished_at REAL
+        ) WITHOUT ROWID
+        """
+    )
+
+
+def _create_run_supply_chain_flags(conn: sqlite3.Connection) -> None:
+    if _table_exists(conn, "run_supply_chain_flags"):
+        return
+    conn.execute(
+        """
+        CREATE TABLE run_supply_chain_flags (
+            flag TEXT NOT NULL,
+            run_id INTEGER NOT NULL,
+            PRIMARY KEY (flag, run_id)
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_run_supply_chain_flags_run
+        ON run_supply_chain_flags (run_id)
+        """
+    )
+    for run_id, raw_summary in conn.execute("SELECT run_id, summary_json FROM workflow_runs").fetchall():
+        try:
+            summary_json = json.loads(raw_summary)
+        except json.JSONDecodeError:
+            continue
+        conn.executemany(INSERT_SUPPLY_CHAIN_FLAG_SQL, supply_chain_flag_rows(run_id, summary_json))
+
+
+def _create_http_validators_updated_index(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_http_validators_updated_at
+        ON http_validators (updated_at)
+        """
+    )
+
+
+def _create_skipped_artifacts_index(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        f"""
+        CREATE INDEX IF NOT EXISTS idx_workflow_runs_skipped_artifacts
+        ON workflow_runs(run_id) WHERE {SKIPPED_ARTIFACTS_SQL}
+        """
+    )
+
+
+def _create_active_runs_index(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        f"""
+        CREATE INDEX IF NOT EXISTS idx_workflow_runs_active
+        ON workflow_runs(conclusion) WHERE {ACTIVE_RUNS_SQL}
+        """
+    )
+
+
+# Append new steps at the end; never renumber or edit a released step.
+MIGRATIONS: tuple[tuple[int, Callable[[sqlite3.Connection], None]], ...] = (
+    (1, _create_workflow_runs),
+    (2, _add_run_timestamps),
+    (3, _create_run_indexes),
+    (4, _create_run_findings),
+    (5, _create_daily_security_rollup),
+    (6, _create_artifact_summary_cache),
+    (7, _create_http_validators),
+    (8, _create_sync_state),
+    (9, _create_pending_summary_index),
+    (10, _create_sync_lease),
+    (11, _create_run_supply_chain_flags),
+    (12, _create_http_validators_updated_index),
+    (13, _create_skipped_artifacts_index),
+    (14, _create_active_runs_index),
+)
+LATEST_SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def run_migrations(conn: sqlite3.Connection) -> tuple[int, int]:
+    initial = schema_version(conn)
+    if initial >= LATEST_SCHEMA_VERSION:
+        return initial, initial
+    version = initial
+    for target, step in MIGRATIONS:
+        if target <= version:
+            continue
+        # IMMEDIATE takes the write lock up front so concurrent processes
+        # serialize here; re-read the version once the lock is held.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if schema_version(conn) < target:
+                step(conn)
+                conn.execute(f"PRAGMA user_version = {target}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        version = target
+    return initial, version
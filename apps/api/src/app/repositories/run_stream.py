@@ -0,0 +1,49 @@
+import json
+from collections.abc import Iterable, Iterator
+from typing import IO, Any
+
+from .json_stream import END_ARRAY, END_MAP, MAP_KEY, START_ARRAY, START_MAP, iter_json_events
+
+
+# Yields the items of a top-level JSON array without reading the whole file.
+def iter_json_array(handle: IO[str], chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    events = iter_json_events(handle.read, chunk_size)
+    if next(events, (None, None))[0] != START_ARRAY:
+        raise ValueError("Expected a JSON array")
+    containers: list[Any] = []
+    keys: list[str | None] = []
+    for event, value in events:
+        if event == MAP_KEY:
+            keys[-1] = value
+            continue
+        if event in (START_MAP, START_ARRAY):
+            containers.append({} if event == START_MAP else [])
+            keys.append(None)
+            continue
+        if event in (END_MAP, END_ARRAY):
+            if not containers:
+                return
+            keys.pop()
+            value = containers.pop()
+        if not containers:
+            yield value
+        elif isinstance(containers[-1], list):
+            containers[-1].append(value)
+        else:
+            containers[-1][keys[-1]] = value
+
+
+def iter_ndjson(lines: Iterable[str | bytes], errors: list[int] | None = None) -> Iterator[Any]:
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            if errors is not None:
+                errors.append(line_number)
+
+
+def iter_ndjson_lines(items: Iterable[Any]) -> Iterator[str]:
+    for item in items:
+        yield json.dumps(item, ensure_ascii=False) + "\n"
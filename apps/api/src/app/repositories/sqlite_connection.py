@@ -0,0 +1,86 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+
+class SQLiteConnectionManager:
+    def __init__(
+        self,
+        storage_path: str | Path,
+        cache_size_kb: int = 16384,
+        mmap_size_bytes: int = 64 * 1024 * 1024,
+        cached_statements: int = 256,
+        busy_timeout_ms: int = 30000,
+        pool_size: int = 8,
+    ):
+        self.storage_path = Path(storage_path)
+        self.cache_size_kb = max(0, cache_size_kb)
+        self.mmap_size_bytes = max(0, mmap_size_bytes)
+        self.cached_statements = max(0, cached_statements)
+        self.busy_timeout_ms = max(0, busy_timeout_ms)
+        self.pool_size = max(0, pool_size)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._idle: list[sqlite3.Connection] = []
+        self._generation = 0
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.storage_path,
+            timeout=self.busy_timeout_ms / 1000,
+            cached_statements=self.cached_statements,
+            check_same_thread=False,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {self.busy_timeout_ms}")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA cache_size = -{self.cache_size_kb}")
+        conn.execute(f"PRAGMA mmap_size = {self.mmap_size_bytes}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        return conn
+
+    def _checkout(self) -> tuple[sqlite3.Connection, int]:
+        with self._lock:
+            generation = self._generation
+            if self._idle:
+                return self._idle.pop(), generation
+        return self._open(), generation
+
+    def _checkin(self, conn: sqlite3.Connection, generation: int) -> None:
+        # Only `pool_size` idle connections are kept, so short-lived threads (dev server requests,
+        # summary workers, lease heartbeats) do not each leave a connection behind.
+        with self._lock:
+            if generation == self._generation and len(self._idle) < self.pool_size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        # Nested use on one thread shares the outer connection and its transaction.
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            yield conn
+            return
+        conn, generation = self._checkout()
+        self._local.conn = conn
+        try:
+            # The connection context commits on success and rolls back on error.
+            with conn:
+                yield conn
+        finally:
+            self._local.conn = None
+            self._checkin(conn, generation)
+
+    def close(self) -> None:
+        with self._lock:
+            connections, self._idle = self._idle, []
+            self._generation += 1
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                continue
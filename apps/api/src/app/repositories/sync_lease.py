@@ -0,0 +1,92 @@
+import json
+import time
+from typing import Any
+
+from .sqlite_connection import SQLiteConnectionManager
+
+
+class SyncLease:
+    def __init__(
+        self,
+        connections: SQLiteConnectionManager,
+        name: str = "pipeline-sync",
+        ttl_seconds: float = 120,
+        clock=time.time,
+    ):
+        self.connections = connections
+        self.name = name
+        self.ttl_seconds = max(1.0, float(ttl_seconds))
+        self.clock = clock
+
+    def try_acquire(self, owner: str, mode: str) -> bool:
+        now = self.clock()
+        # A single upsert is atomic in SQLite, so at most one process can take a free or expired lease.
+        with self.connections.connection() as conn:
+            cursor = conn.execute(
+                """
+                INSERT INTO sync_lease (name, owner, mode, expires_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET
+                    owner = excluded.owner,
+                    mode = excluded.mode,
+                    expires_at = excluded.expires_at
+                WHERE sync_lease.owner = '' OR sync_lease.owner = excluded.owner OR sync_lease.expires_at < ?
+                """,
+                (self.name, owner, mode, now + self.ttl_seconds, now),
+            )
+            return cursor.rowcount == 1
+
+    def renew(self, owner: str) -> bool:
+        with self.connections.connection() as conn:
+            cursor = conn.execute(
+                "UPDATE sync_lease SET expires_at = ? WHERE name = ? AND owner = ?",
+                (self.clock() + self.ttl_seconds, self.name, owner),
+            )
+            return cursor.rowcount == 1
+
+    def release(self, owner: str, result: dict[str, Any] | None) -> None:
+        with self.connections.connection() as conn:
+            conn.execute(
+                """
+                UPDATE sync_lease SET
+                    owner = '',
+                    expires_at = 0,
+                    generation = generation + 1,
+                    result_mode = mode,
+                    result_json = ?,
+                    finished_at = ?
+                WHERE name = ? AND owner = ?
+                """,
+                (
+                    json.dumps(result, sort_keys=True) if result is not None else None,
+                    self.clock(),
+                    self.name,
+                    owner,
+                ),
+            )
+
+    def state(self) -> dict[str, Any]:
+        with self.connections.connection() as conn:
+            row = conn.execute(
+                """
+                SELECT owner, mode, expires_at, generation, result_mode, result_json, finished_at
+                FROM sync_lease WHERE name = ?
+                """,
+                (self.name,),
+            ).fetchone()
+        if row is None:
+            return {
+                "owner": "",
+                "mode": "",
+                "expires_at": 0,
+                "generation": 0,
+                "result_mode": "",
+                "result": None,
+                "finished_at": None,
+            }
+        state = dict(row)
+        raw_result = state.pop("result_json")
+        try:
+            state["result"] = json.loads(raw_result) if raw_result else None
+        except json.JSONDecodeError:
+            state["result"] = None
+        return state
@@ -1,50 +1,260 @@
 import json
+import math
 import sqlite3
+from collections.abc import Iterable, Iterator
+from contextlib import AbstractContextManager
+from datetime import date, datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from ..models.workflow_run import derive_run_timestamps
+from .migrations import (
+    ACTIVE_RUNS_SQL,
+    ADD_ROLLUP_SQL,
+    INSERT_FINDING_SQL,
+    INSERT_SUPPLY_CHAIN_FLAG_SQL,
+    PENDING_SUMMARY_SQL,
+    SKIPPED_ARTIFACTS_SQL,
+    TIMESTAMP_COLUMNS,
+    day_key,
+    finding_rows,
+    run_migrations,
+    schema_version,
+    supply_chain_flag_rows,
+)
+from .run_stream import iter_json_array
+from .sqlite_connection import SQLiteConnectionManager
+
+# API field name -> workflow_runs column.
+RUN_FIELD_COLUMNS = {
+    "id": "run_id",
+    "workflow_name": "workflow_name",
+    "category": "category",
+    "conclusion": "conclusion",
+    "branch": "branch",
+    "commit_sha": "commit_sha",
+    "started_at": "started_at",
+    "completed_at": "completed_at",
+    "duration": "duration",
+    "html_url": "html_url",
+    "summary_json": "summary_json",
+    "synced_at": "synced_at",
+}
+RUN_FIELDS = tuple(RUN_FIELD_COLUMNS)
+RUN_LIST_FIELDS = tuple(name for name in RUN_FIELDS if name != "summary_json")
+
+# seq records first-seen order only; listing order comes from started_epoch. It is bound as ?18
+# and only written for new rows.
+UPSERT_RUN_SQL = """
+INSERT INTO workflow_runs (
+    run_id, seq, workflow_name, category, conclusion, branch, commit_sha,
+    started_at, completed_at, duration, html_url, summary_json, synced_at,
+    started_epoch, completed_epoch, synced_epoch, run_epoch, run_day
+) VALUES (
+    ?1, ?18,
+    ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9, ?10, ?11, ?12, ?13, ?14, ?15, ?16, ?17
+)
+ON CONFLICT(run_id) DO UPDATE SET
+    workflow_name = excluded.workflow_name,
+    category = excluded.category,
+    conclusion = excluded.conclusion,
+    branch = excluded.branch,
+    commit_sha = excluded.commit_sha,
+    started_at = excluded.started_at,
+    completed_at = excluded.completed_at,
+    duration = excluded.duration,
+    html_url = excluded.html_url,
+    summary_json = excluded.summary_json,
+    synced_at = excluded.synced_at,
+    started_epoch = excluded.started_epoch,
+    completed_epoch = excluded.completed_epoch,
+    synced_epoch = excluded.synced_epoch,
+    run_epoch = excluded.run_epoch,
+    run_day = excluded.run_day
+WHERE workflow_runs.workflow_name IS NOT excluded.workflow_name
+   OR workflow_runs.category IS NOT excluded.category
+   OR workflow_runs.conclusion IS NOT excluded.conclusion
+   OR workflow_runs.branch IS NOT excluded.branch
+   OR workflow_runs.commit_sha IS NOT excluded.commit_sha
+   OR workflow_runs.started_at IS NOT excluded.started_at
+   OR workflow_runs.completed_at IS NOT excluded.completed_at
+   OR workflow_runs.duration IS NOT excluded.duration
+   OR workflow_runs.html_url IS NOT excluded.html_url
+   OR workflow_runs.summary_json IS NOT excluded.summary_json
+"""
+
+
+def _build_filters(category: str = "", branch: str = "", conclusion: str = "") -> tuple[str, list[Any]]:
+    clauses: list[str] = []
+    params: list[Any] = []
+    if conclusion:
+        clauses.append("conclusion = ?")
+        params.append(conclusion)
+    if category:
+        clauses.append("category = ?")
+        params.append(category)
+    if branch:
+        clauses.append("branch = ? COLLATE NOCASE")
+        params.append(branch)
+    if not clauses:
+        return "", params
+    return "WHERE " + " AND ".join(clauses), params
+
+
+def _run_params(run: dict[str, Any]) -> tuple[Any, ...]:
+    started_at = run.get("started_at", "")
+    completed_at = run.get("completed_at", "")
+    synced_at = run.get("synced_at", "")
+    # WorkflowRun already parsed these (None means unparseable); only legacy/imported dicts
+    # that lack a column or hold a non-int value are re-derived here.
+    timestamps = {key: run.get(key) for key in TIMESTAMP_COLUMNS}
+    if any(key not in run or not isinstance(run[key], (int, type(None))) for key in TIMESTAMP_COLUMNS):
+        derived = derive_run_timestamps(started_at, completed_at, synced_at)
+        for key in TIMESTAMP_COLUMNS:
+            if not isinstance(timestamps[key], int):
+                timestamps[key] = derived[key]
+    return (
+        run["id"],
+        run.get("workflow_name", "unknown"),
+        run.get("category", "other"),
+        run.get("conclusion", "unknown"),
+        run.get("branch", ""),
+        run.get("commit_sha", ""),
+        started_at,
+        completed_at,
+        run.get("duration"),
+        run.get("html_url", ""),
+        json.dumps(run.get("summary_json", {}), ensure_ascii=False, sort_keys=True),
+        synced_at,
+        *(timestamps[key] for key in TIMESTAMP_COLUMNS),
+    )
+
+
+# NOT NULL text columns and the value a missing or null field falls back to on import.
+IMPORT_TEXT_DEFAULTS = {
+    "workflow_name": "unknown",
+    "category": "other",
+    "conclusion": "unknown",
+    "branch": "",
+    "commit_sha": "",
+    "started_at": "",
+    "completed_at": "",
+    "html_url": "",
+    "synced_at": "",
+}
+
+
+SQLITE_INT_MIN = -(2**63)
+SQLITE_INT_MAX = 2**63 - 1
+
+
+def _sqlite_int(value: Any) -> bool:
+    if not isinstance(value, int) or isinstance(value, bool):
+        return False
+    return SQLITE_INT_MIN <= value <= SQLITE_INT_MAX
+
+
+def _coerce_imported_run(run: Any) -> dict[str, Any] | None:
+    # Imported rows come from files, not WorkflowRun; anything the columns cannot hold is
+    # rejected here so one bad line does not fail the whole batch.
+    if not isinstance(run, dict):
+        return None
+    run_id = run.get("id")
+    if not _sqlite_int(run_id):
+        return None
+    coerced: dict[str, Any] = {"id": run_id}
+    for key, default in IMPORT_TEXT_DEFAULTS.items():
+        value = run.get(key)
+        if value is None:
+            value = default
+        elif not isinstance(value, str):
+            return None
+        coerced[key] = value
+    duration = run.get("duration")
+    if isinstance(duration, float) and math.isfinite(duration):
+        duration = int(duration)
+    if duration is not None and not _sqlite_int(duration):
+        return None
+    coerced["duration"] = duration
+    summary_json = run.get("summary_json")
+    if summary_json is None:
+        summary_json = {}
+    elif not isinstance(summary_json, dict):
+        return None
+    coerced["summary_json"] = summary_json
+    return coerced
+
+
+def _placeholders(values: tuple[Any, ...] | list[Any]) -> str:
+    return ", ".join("?" for _ in values)
+
+
+def _select_columns(fields: tuple[str, ...]) -> str:
+    return ", ".join(RUN_FIELD_COLUMNS[name] for name in fields)
+
+
+def _decode_summary(raw: str) -> dict[str, Any]:
+    try:
+        summary_json = json.loads(raw)
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(summary_json, dict):
+        return {}
+    return summary_json
+
+
+def _row_to_run(row: sqlite3.Row, fields: tuple[str, ...] = RUN_FIELDS) -> dict[str, Any]:
+    run: dict[str, Any] = {}
+    for name in fields:
+        value = row[RUN_FIELD_COLUMNS[name]]
+        run[name] = _decode_summary(value) if name == "summary_json" else value
+    return run
+
 
 class WorkflowRunRepository:
-    def __init__(self, storage_path: str, legacy_json_path: str | None = None):
+    def __init__(
+        self,
+        storage_path: str,
+        legacy_json_path: str | None = None,
+        connections: SQLiteConnectionManager | None = None,
+    ):
         self.storage_path = Path(storage_path)
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
         self.legacy_json_path = Path(legacy_json_path) if legacy_json_path else None
-        self._init_db()
-        self._migrate_legacy_json_once()
+        self.connections = connections or SQLiteConnectionManager(self.storage_path)
+        self.migrate()
 
-    def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.storage_path, timeout=30)
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA busy_timeout = 30000")
-        return conn
+    def _connect(self) -> AbstractContextManager[sqlite3.Connection]:
+        return self.connections.connection()
 
-    def _init_db(self) -> None:
+    def close(self) -> None:
+        self.connections.close()
+
+    def migrate(self) -> int:
         with self._connect() as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS workflow_runs (
-                    run_id INTEGER PRIMARY KEY,
-                    seq INTEGER NOT NULL,
-                    workflow_name TEXT NOT NULL,
-                    category TEXT NOT NULL,
-                    conclusion TEXT NOT NULL,
-                    branch TEXT NOT NULL,
-                    commit_sha TEXT NOT NULL,
-                    started_at TEXT NOT NULL,
-                    completed_at TEXT NOT NULL,
-                    duration INTEGER,
-                    html_url TEXT NOT NULL,
-                    summary_json TEXT NOT NULL,
-                    synced_at TEXT NOT NULL
-                )
-                """
-            )
-            conn.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_workflow_runs_seq
-                ON workflow_runs (seq)
-                """
-            )
+            initial, version = run_migrations(conn)
+        # The legacy JSON store is only considered for databases that predate
+        # versioning, so an up-to-date database never pays for the check.
+        if initial == 0:
+            self._migrate_legacy_json_once()
+        return version
+
+    def schema_version(self) -> int:
+        with self._connect() as conn:
+            return schema_version(conn)
+
+    @staticmethod
+    def _apply_rollup(conn: sqlite3.Connection, day: str | None, run_id: int, sign: int) -> None:
+        if day is None:
+            return
+        rows = conn.execute(
+            "SELECT severity, SUM(count) AS total FROM run_findings WHERE run_id = ? GROUP BY severity",
+            (run_id,),
+        ).fetchall()
+        for row in rows:
+            conn.execute(ADD_ROLLUP_SQL, (day, row["severity"], sign * row["total"]))
+        if sign < 0 and rows:
+            conn.execute("DELETE FROM daily_security_rollup WHERE day = ? AND count <= 0", (day,))
 
     def _migrate_legacy_json_once(self) -> None:
         if self.legacy_json_path is None:
@@ -55,81 +265,293 @@ class WorkflowRunRepository:
             current_count = conn.execute("SELECT COUNT(1) AS cnt FROM workflow_runs").fetchone()["cnt"]
         if current_count > 0:
             return
-        try:
-            content = json.loads(self.legacy_json_path.read_text(encoding="utf-8"))
-        except json.JSONDecodeError:
-            return
-        if not isinstance(content, list):
-            return
-        self.save_runs(content)
+        with self.legacy_json_path.open(encoding="utf-8") as handle:
+            try:
+                self.import_runs(iter_json_array(handle))
+            except ValueError:
+                # Keep whatever batches were imported before the malformed part.
+                return
 
-    def list_runs(self) -> list[dict[str, Any]]:
+    def list_runs(
+        self,
+        category: str = "",
+        branch: str = "",
+        conclusion: str = "",
+        limit: int | None = None,
+        offset: int = 0,
+        fields: tuple[str, ...] = RUN_FIELDS,
+    ) -> list[dict[str, Any]]:
+        where, params = _build_filters(category=category, branch=branch, conclusion=conclusion)
+        query = (
+            f"SELECT {_select_columns(fields)} FROM workflow_runs {where} "
+            "ORDER BY started_epoch DESC, run_id DESC"
+        )
+        if limit is not None:
+            query += " LIMIT ? OFFSET ?"
+            params.extend([limit, max(0, offset)])
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [_row_to_run(row, fields) for row in rows]
+
+    def get_run(self, run_id: int, fields: tuple[str, ...] = RUN_FIELDS) -> dict[str, Any] | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT {_select_columns(fields)} FROM workflow_runs WHERE run_id = ?",
+                (run_id,),
+            ).fetchone()
+        return _row_to_run(row, fields) if row else None
+
+    def get_runs(self, run_ids: list[int], fields: tuple[str, ...] = RUN_FIELDS) -> dict[int, dict[str, Any]]:
+        selected = fields if "id" in fields else ("id", *fields)
+        runs: dict[int, dict[str, Any]] = {}
+        for start in range(0, len(run_ids), 500):
+            chunk = run_ids[start : start + 500]
+            with self._connect() as conn:
+                rows = conn.execute(
+                    f"""
+                    SELECT {_select_columns(selected)} FROM workflow_runs
+                    WHERE run_id IN ({_placeholders(chunk)})
+                    """,
+                    chunk,
+                ).fetchall()
+            for row in rows:
+                run = _row_to_run(row, selected)
+                runs[run["id"]] = run
+        return runs
+
+    def count_runs(self, category: str = "", branch: str = "") -> int:
+        where, params = _build_filters(category=category, branch=branch)
+        with self._connect() as conn:
+            row = conn.execute(f"SELECT COUNT(*) AS cnt FROM workflow_runs {where}", params).fetchone()
+        return row["cnt"]
+
+    def conclusion_counts(self) -> dict[str, int]:
         with self._connect() as conn:
             rows = conn.execute(
+                "SELECT conclusion, COUNT(*) AS cnt FROM workflow_runs GROUP BY conclusion"
+            ).fetchall()
+        return {row["conclusion"]: row["cnt"] for row in rows}
+
+    def latest_conclusion(self, category: str) -> str | None:
+        with self._connect() as conn:
+            row = conn.execute(
                 """
-                SELECT run_id, workflow_name, category, conclusion, branch, commit_sha,
-                       started_at, completed_at, duration, html_url, summary_json, synced_at
-                FROM workflow_runs
-                ORDER BY seq ASC
-                """
+                SELECT conclusion FROM workflow_runs
+                WHERE category = ?
+                ORDER BY started_epoch DESC, run_id DESC
+                LIMIT 1
+                """,
+                (category,),
+            ).fetchone()
+        return row["conclusion"] if row else None
+
+    def finding_totals(
+        self,
+        tools: tuple[str, ...],
+        severities: tuple[str, ...],
+    ) -> list[tuple[str, str, int]]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT tool, severity, SUM(count) AS total
+                FROM run_findings
+                WHERE tool IN ({_placeholders(tools)})
+                  AND severity IN ({_placeholders(severities)})
+                GROUP BY tool, severity
+                """,
+                (*tools, *severities),
             ).fetchall()
-        runs: list[dict[str, Any]] = []
-        for row in rows:
-            try:
-                summary_json = json.loads(row["summary_json"])
-            except json.JSONDecodeError:
-                summary_json = {}
-            if not isinstance(summary_json, dict):
-                summary_json = {}
-            runs.append(
-                {
-                    "id": row["run_id"],
-                    "workflow_name": row["workflow_name"],
-                    "category": row["category"],
-                    "conclusion": row["conclusion"],
-                    "branch": row["branch"],
-                    "commit_sha": row["commit_sha"],
-                    "started_at": row["started_at"],
-                    "completed_at": row["completed_at"],
-                    "duration": row["duration"],
-                    "html_url": row["html_url"],
-                    "summary_json": summary_json,
-                    "synced_at": row["synced_at"],
-                }
-            )
-        return runs
+        return [(row["tool"], row["severity"], row["total"]) for row in rows]
 
-    def save_runs(self, runs: list[dict[str, Any]]) -> None:
-        with self._connect() as conn:
-            conn.execute("DELETE FROM workflow_runs")
-            payload = []
-            for idx, run in enumerate(runs):
-                run_id = run.get("id")
-                if not isinstance(run_id, int):
-                    continue
-                payload.append(
-                    (
-                        run_id,
-                        idx,
-                        run.get("workflow_name", "unknown"),
-                        run.get("category", "other"),
-                        run.get("conclusion", "unknown"),
-                        run.get("branch", ""),
-                        run.get("commit_sha", ""),
-                        run.get("started_at", ""),
-                        run.get("completed_at", ""),
-                        run.get("duration"),
-                        run.get("html_url", ""),
-                        json.dumps(run.get("summary_json", {}), ensure_ascii=False),
-                        run.get("synced_at", ""),
-                    )
-                )
-            conn.executemany(
+    def latest_run(self, category: str, fields: tuple[str, ...] = RUN_FIELDS) -> dict[str, Any] | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                f"""
+                SELECT {_select_columns(fields)} FROM workflow_runs
+                WHERE category = ?
+                ORDER BY run_epoch DESC, run_id DESC
+                LIMIT 1
+                """,
+                (category,),
+            ).fetchone()
+        return _row_to_run(row, fields) if row else None
+
+    def latest_run_day(self) -> date | None:
+        with self._connect() as conn:
+            row = conn.execute("SELECT MAX(run_day) AS run_day FROM workflow_runs").fetchone()
+        return date.fromordinal(row["run_day"]) if row["run_day"] else None
+
+    def daily_security_rollup(
+        self,
+        start_day: str,
+        end_day: str,
+        severities: tuple[str, ...],
+    ) -> list[tuple[str, str, int]]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT day, severity, count FROM daily_security_rollup
+                WHERE day BETWEEN ? AND ?
+                  AND severity IN ({_placeholders(severities)})
+                """,
+                (start_day, end_day, *severities),
+            ).fetchall()
+        return [(row["day"], row["severity"], row["count"]) for row in rows]
+
+    def supply_chain_flags(self, keys: tuple[str, ...]) -> dict[str, bool]:
+        flags: dict[str, bool] = {}
+        with self._connect() as conn:
+            for key in keys:
+                row = conn.execute(
+                    "SELECT 1 FROM run_supply_chain_flags WHERE flag = ? LIMIT 1",
+                    (key,),
+                ).fetchone()
+                flags[key] = row is not None
+        return flags
+
+    def pending_summary_run_ids(self, limit: int = 50) -> list[int]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT run_id FROM workflow_runs WHERE {PENDING_SUMMARY_SQL} ORDER BY run_id DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [row["run_id"] for row in rows]
+
+    def count_skipped_artifact_runs(self) -> int:
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT COUNT(*) AS total FROM workflow_runs WHERE {SKIPPED_ARTIFACTS_SQL}"
+            ).fetchone()
+        return int(row["total"])
+
+    def count_active_runs(self) -> int:
+        with self._connect() as conn:
+            row = conn.execute(f"SELECT COUNT(*) AS total FROM workflow_runs WHERE {ACTIVE_RUNS_SQL}").fetchone()
+        return int(row["total"])
+
+    def count_pending_summaries(self) -> int:
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT COUNT(*) AS total FROM workflow_runs WHERE {PENDING_SUMMARY_SQL}"
+            ).fetchone()
+        return int(row["total"])
+
+    def get_sync_state(self, key: str) -> Any:
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        try:
+            return json.loads(row["value"])
+        except json.JSONDecodeError:
+            return None
+
+    def set_sync_state(self, key: str, value: Any) -> None:
+        with self._connect() as conn:
+            if value is None:
+                conn.execute("DELETE FROM sync_state WHERE key = ?", (key,))
+                return
+            conn.execute(
                 """
-                INSERT INTO workflow_runs (
-                    run_id, seq, workflow_name, category, conclusion, branch, commit_sha,
-                    started_at, completed_at, duration, html_url, summary_json, synced_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO sync_state (key, value, updated_at) VALUES (?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at
                 """,
-                payload,
+                (key, json.dumps(value), datetime.now(timezone.utc).isoformat()),
             )
+
+    def iter_runs(self, batch_size: int = 500) -> Iterator[dict[str, Any]]:
+        # Keyset pagination keeps each read short instead of one long cursor.
+        last_run_id = -(2**63)
+        while True:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    f"""
+                    SELECT {_select_columns(RUN_FIELDS)} FROM workflow_runs
+                    WHERE run_id > ?
+                    ORDER BY run_id
+                    LIMIT ?
+                    """,
+                    (last_run_id, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield _row_to_run(row)
+            last_run_id = rows[-1]["run_id"]
+
+    def import_runs(self, runs: Iterable[Any], batch_size: int = 500) -> dict[str, int]:
+        totals = {"inserted": 0, "updated": 0, "unchanged": 0, "skipped": 0}
+        batch: list[dict[str, Any]] = []
+
+        def _flush() -> None:
+            for key, value in self.upsert_runs(batch).items():
+                totals[key] += value
+            batch.clear()
+
+        for run in runs:
+            coerced = _coerce_imported_run(run)
+            if coerced is None:
+                totals["skipped"] += 1
+                continue
+            batch.append(coerced)
+            if len(batch) >= batch_size:
+                _flush()
+        if batch:
+            _flush()
+        return totals
+
+    def upsert_runs(self, runs: list[dict[str, Any]]) -> dict[str, int]:
+        payload = []
+        summaries: dict[int, Any] = {}
+        for run in runs:
+            run_id = run.get("id")
+            if not isinstance(run_id, int):
+                continue
+            summaries[run_id] = run.get("summary_json", {})
+            payload.append(_run_params(run))
+
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+        if not payload:
+            return counts
+        with self._connect() as conn:
+            existing = self._existing_run_days(conn, [row[0] for row in payload])
+            # seq has no index, so the next value is read once per batch rather than per row.
+            next_seq = None
+            if any(row[0] not in existing for row in payload):
+                next_seq = conn.execute("SELECT COALESCE(MAX(seq), -1) + 1 FROM workflow_runs").fetchone()[0]
+            for row in payload:
+                # Existing rows keep their seq; NOT NULL is checked before the conflict, so bind 0.
+                seq = 0
+                if row[0] not in existing:
+                    seq = next_seq
+                    next_seq += 1
+                changed = conn.execute(UPSERT_RUN_SQL, (*row, seq)).rowcount > 0
+                if changed:
+                    self._apply_rollup(conn, existing.get(row[0]), row[0], sign=-1)
+                    conn.execute("DELETE FROM run_findings WHERE run_id = ?", (row[0],))
+                    conn.executemany(INSERT_FINDING_SQL, finding_rows(row[0], summaries[row[0]]))
+                    conn.execute("DELETE FROM run_supply_chain_flags WHERE run_id = ?", (row[0],))
+                    conn.executemany(
+                        INSERT_SUPPLY_CHAIN_FLAG_SQL, supply_chain_flag_rows(row[0], summaries[row[0]])
+                    )
+                    self._apply_rollup(conn, day_key(row[-1]), row[0], sign=1)
+                if row[0] not in existing:
+                    counts["inserted"] += 1
+                    existing[row[0]] = day_key(row[-1])
+                elif changed:
+                    counts["updated"] += 1
+                else:
+                    counts["unchanged"] += 1
+        return counts
+
+    @staticmethod
+    def _existing_run_days(conn: sqlite3.Connection, run_ids: list[int]) -> dict[int, str | None]:
+        existing: dict[int, str | None] = {}
+        for start in range(0, len(run_ids), 500):
+            chunk = run_ids[start : start + 500]
+            rows = conn.execute(
+                f"SELECT run_id, run_day FROM workflow_runs WHERE run_id IN ({_placeholders(chunk)})",
+                chunk,
+            ).fetchall()
+            existing.update((row["run_id"], day_key(row["run_day"])) for row in rows)
+        return existing
@@ -1,19 +1,36 @@
-from hmac import compare_digest
+import hashlib
+import hmac
+import json
 
-from flask import Blueprint, current_app, jsonify, request
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context, url_for
 
-from ..schemas.pipeline_schema import build_runs_response, build_sync_response
-from ..services.github_service import GithubServiceError
-from ..services.pipeline_service import PipelineService
+from ..repositories.workflow_run_repository import RUN_FIELDS, RUN_LIST_FIELDS
+from ..schemas.pipeline_schema import build_runs_response, build_sync_job_response
+from ..services.container import ServiceContainer
+from ..services.pipeline_service import SYNC_MODES, PipelineService
 
 pipelines_bp = Blueprint("pipelines", __name__, url_prefix="/api/pipelines")
 
 
+def _service_container() -> ServiceContainer:
+    container = current_app.extensions.get("service_container")
+    if container is None:
+        raise RuntimeError("service_container is not configured")
+    return container
+
+
 def _pipeline_service() -> PipelineService:
-    factory = current_app.extensions.get("pipeline_service_factory")
-    if callable(factory):
-        return factory()
-    raise RuntimeError("pipeline_service_factory is not configured")
+    return _service_container().pipeline_service
+
+
+def _parse_fields(raw: str) -> tuple[str, ...]:
+    requested = [name.strip() for name in raw.split(",") if name.strip()]
+    if not requested:
+        return RUN_LIST_FIELDS
+    unknown = [name for name in requested if name not in RUN_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return tuple(dict.fromkeys(requested))
 
 
 @pipelines_bp.get("/runs")
@@ -22,11 +39,16 @@ def get_runs():
     page = request.args.get("page", default=1, type=int)
     category = request.args.get("category", default="", type=str)
     branch = request.args.get("branch", default="", type=str)
+    try:
+        fields = _parse_fields(request.args.get("fields", default="", type=str))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
     runs, total, total_pages = _pipeline_service().list_runs(
         limit=limit,
         page=page,
         category=category,
         branch=branch,
+        fields=fields,
     )
     return jsonify(
         build_runs_response(
@@ -43,6 +65,14 @@ def get_runs():
     )
 
 
+@pipelines_bp.get("/runs/<int:run_id>")
+def get_run(run_id: int):
+    run = _pipeline_service().get_run(run_id)
+    if run is None:
+        return jsonify({"error": "Run not found"}), 404
+    return jsonify(run)
+
+
 @pipelines_bp.get("/summary")
 def get_summary():
     return jsonify(_pipeline_service().summary())
@@ -59,15 +89,39 @@ def get_security_trends():
     return jsonify(_pipeline_service().security_trends(days=days))
 
 
-@pipelines_bp.post("/sync")
-def sync_runs():
+def _check_sync_token():
     sync_token = current_app.config["SYNC_TOKEN"]
     if not sync_token:
         return jsonify({"error": "SYNC_TOKEN must be configured on server"}), 503
 
     provided_token = request.headers.get("X-Sync-Token", "")
-    if not compare_digest(str(provided_token), str(sync_token)):
+    if not hmac.compare_digest(str(provided_token), str(sync_token)):
         return jsonify({"error": "Unauthorized sync request"}), 401
+    return None
+
+
+@pipelines_bp.get("/export")
+def export_runs():
+    denied = _check_sync_token()
+    if denied:
+        return denied
+    lines = _pipeline_service().export_runs()
+    return Response(stream_with_context(lines), mimetype="application/x-ndjson")
+
+
+@pipelines_bp.post("/import")
+def import_runs():
+    denied = _check_sync_token()
+    if denied:
+        return denied
+    return jsonify(_pipeline_service().import_runs(request.stream))
+
+
+@pipelines_bp.post("/sync")
+def sync_runs():
+    denied = _check_sync_token()
+    if denied:
+        return denied
 
     owner = current_app.config["GITHUB_OWNER"]
     repo = current_app.config["GITHUB_REPO"]
@@ -83,19 +137,86 @@ def sync_runs():
 
     per_page = request.args.get("per_page", default=30, type=int)
     per_page = max(1, min(per_page, 100))
+    mode = request.args.get("mode", default="incremental", type=str).strip().lower()
+    if mode not in SYNC_MODES:
+        return jsonify({"error": f"mode must be one of: {', '.join(SYNC_MODES)}"}), 400
+    job, created = _service_container().sync_jobs.submit(per_page=per_page, mode=mode)
+    payload = build_sync_job_response(job)
+    payload["coalesced"] = not created
+    response = jsonify(payload)
+    response.status_code = 202
+    response.headers["Location"] = url_for("pipelines.get_sync_job", job_id=job.id)
+    return response
+
+
+@pipelines_bp.get("/sync/<job_id>")
+def get_sync_job(job_id: str):
+    denied = _check_sync_token()
+    if denied:
+        return denied
+
+    job = _service_container().sync_jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "sync job not found"}), 404
+    debug_requested = request.args.get("debug", default="", type=str).strip().lower() in {
+        "1",
+        "true",
+        "yes",
+    }
+    return jsonify(build_sync_job_response(job, include_detail=debug_requested))
+
+
+@pipelines_bp.get("/poller")
+def poller_status():
+    schedule = current_app.extensions.get("sync_poller_schedule")
+    if schedule is None:
+        return jsonify({"enabled": False})
+    return jsonify({"enabled": True, **schedule.snapshot()})
+
+
+def _valid_webhook_signature(secret: str, body: bytes, signature: str) -> bool:
+    expected = "sha256=" + hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature.strip())
+
+
+@pipelines_bp.post("/webhook")
+def receive_webhook():
+    secret = current_app.config["GITHUB_WEBHOOK_SECRET"]
+    if not secret:
+        return jsonify({"error": "GITHUB_WEBHOOK_SECRET must be configured on server"}), 503
+
+    body = request.get_data(cache=False)
+    if not _valid_webhook_signature(secret, body, request.headers.get("X-Hub-Signature-256", "")):
+        return jsonify({"error": "Invalid webhook signature"}), 401
+
+    event = request.headers.get("X-GitHub-Event", "")
+    if event == "ping":
+        return jsonify({"ok": True})
+    if event != "workflow_run":
+        return jsonify({"ignored": True, "reason": f"unsupported event: {event}"}), 202
+
     try:
-        result = _pipeline_service().sync(per_page=per_page)
-    except GithubServiceError as exc:
-        return jsonify({"error": str(exc)}), 502
-    except Exception as exc:
-        current_app.logger.exception("Unexpected error while syncing pipeline runs")
-        debug_requested = request.args.get("debug", default="", type=str).strip().lower() in {
-            "1",
-            "true",
-            "yes",
-        }
-        payload = {"error": "Internal sync error"}
-        if debug_requested:
-            payload["detail"] = f"{type(exc).__name__}: {exc}"
-        return jsonify(payload), 500
-    return jsonify(build_sync_response(result["synced"]))
+        payload = json.loads(body)
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        return jsonify({"error": "Invalid JSON payload"}), 400
+    raw = payload.get("workflow_run") if isinstance(payload, dict) else None
+    if not isinstance(raw, dict):
+        return jsonify({"error": "workflow_run payload is missing"}), 400
+
+    repository = payload.get("repository")
+    if not isinstance(repository, dict):
+        return jsonify({"error": "repository payload is missing"}), 400
+
+    expected_repo = f"{current_app.config['GITHUB_OWNER']}/{current_app.config['GITHUB_REPO']}".lower()
+    full_name = str(repository.get("full_name", "")).lower()
+    if full_name != expected_repo:
+        return jsonify({"ignored": True, "reason": "repository does not match"}), 202
+
+    result = _pipeline_service().ingest_workflow_run(raw)
+    response = {key: result.get(key, 0) for key in ("run_id", "inserted", "updated", "unchanged")}
+    response["ignored"] = result["ignored"]
+    response["summary_job_id"] = None
+    if result["needs_summary"]:
+        job, _ = _service_container().sync_jobs.submit_summaries([result["run_id"]])
+        response["summary_job_id"] = job.id
+    return jsonify(response), 202 if result["needs_summary"] else 200
@@ -20,5 +20,40 @@ def build_runs_response(
     }
 
 
-def build_sync_response(synced: int) -> dict[str, int]:
-    return {"synced_runs": synced}
+def build_sync_response(result: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "synced_runs": result.get("synced", 0),
+        "summarized_runs": result.get("summarized", 0),
+        "inserted": result.get("inserted", 0),
+        "updated": result.get("updated", 0),
+        "unchanged": result.get("unchanged", 0),
+        "not_modified": bool(result.get("not_modified", False)),
+        "mode": result.get("mode", "incremental"),
+        "per_page": result.get("per_page", 0),
+        "pages": result.get("pages", 0),
+        "backfill_complete": bool(result.get("backfill_complete", False)),
+        "pending_summaries": result.get("pending_summaries", 0),
+        "rate_limit": result.get("rate_limit", {}),
+        "shared": bool(result.get("shared", False)),
+    }
+
+
+def build_sync_job_response(job: Any, include_detail: bool = False) -> dict[str, Any]:
+    payload = {
+        "job_id": job.id,
+        "status": job.status,
+        "mode": job.mode,
+        "per_page": job.per_page,
+        "trigger": job.trigger,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+        "progress": dict(job.progress),
+        "result": build_sync_response(job.result) if job.result is not None else None,
+        "error": job.error,
+    }
+    if job.run_ids:
+        payload["run_ids"] = list(job.run_ids)
+    if include_detail and job.error_detail:
+        payload["detail"] = job.error_detail
+    return payload
@@ -0,0 +1,121 @@
+import io
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import IO
+
+from .artifact_summary import ArchiveAnalysis, ArchiveLimits, analyze_archive
+from .http_pool import STREAM_CHUNK_BYTES
+
+logger = logging.getLogger(__name__)
+
+
+def _analyze_archive_file(artifact_name: str, path: str, limits: ArchiveLimits) -> ArchiveAnalysis:
+    with open(path, "rb") as archive:
+        return analyze_archive(artifact_name, archive, limits)
+
+
+class PendingArchive:
+    def __init__(
+        self,
+        artifact_name: str,
+        limits: ArchiveLimits,
+        future: Future,
+        path: str = "",
+        on_broken: Callable[[], None] | None = None,
+    ):
+        self.artifact_name = artifact_name
+        self.limits = limits
+        self.future = future
+        self.path = path
+        self.on_broken = on_broken
+
+    def result(self) -> ArchiveAnalysis:
+        try:
+            return self.future.result()
+        except BrokenProcessPool:
+            # A worker died (OOM, signal); parse this archive here rather than lose it.
+            logger.warning("Artifact parse worker died; parsing %s inline", self.artifact_name)
+            if self.on_broken is not None:
+                self.on_broken()
+            return _analyze_archive_file(self.artifact_name, self.path, self.limits)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        self.future.cancel()
+        path, self.path = self.path, ""
+        if path:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+
+class ArtifactParsePool:
+    # Offloads archive decompression and JSON analysis to worker processes so a large sync does
+    # not hold the GIL the API threads need. workers=0 keeps everything inline.
+    def __init__(self, workers: int = 0, min_archive_bytes: int = 1024 * 1024):
+        self.workers = max(0, workers)
+        self.min_archive_bytes = max(0, min_archive_bytes)
+        self._lock = threading.Lock()
+        self._executor: ProcessPoolExecutor | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # The API process runs several threads, which fork() does not copy safely.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _discard(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, artifact_name: str, archive: IO[bytes], limits: ArchiveLimits) -> PendingArchive:
+        # Small archives cost more to ship to a worker than to parse, so they stay inline.
+        archive.seek(0, io.SEEK_END)
+        size = archive.tell()
+        archive.seek(0)
+        if not self.enabled or size < self.min_archive_bytes:
+            future: Future = Future()
+            future.set_result(analyze_archive(artifact_name, archive, limits))
+            return PendingArchive(artifact_name, limits, future)
+
+        # Workers get a file path, never the archive bytes, so in-flight jobs cost disk rather
+        # than memory in both processes. The file is removed once the result is collected.
+        with tempfile.NamedTemporaryFile(prefix="artifact-", suffix=".zip", delete=False) as spool:
+            path = spool.name
+            try:
+                shutil.copyfileobj(archive, spool, STREAM_CHUNK_BYTES)
+            except BaseException:
+                os.unlink(path)
+                raise
+        executor = self._pool()
+        try:
+            future = executor.submit(_analyze_archive_file, artifact_name, path, limits)
+        except BrokenProcessPool as exc:
+            future = Future()
+            future.set_exception(exc)
+        return PendingArchive(artifact_name, limits, future, path, lambda: self._discard(executor))
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,95 @@
+import threading
+
+from ..repositories.artifact_summary_cache import ArtifactSummaryCache
+from ..repositories.http_validator_cache import HttpValidatorCache
+from ..repositories.sqlite_connection import SQLiteConnectionManager
+from ..repositories.sync_lease import SyncLease
+from ..repositories.workflow_run_repository import WorkflowRunRepository
+from .artifact_parse_pool import ArtifactParsePool
+from .artifact_summary import ArchiveLimits
+from .github_service import GithubService
+from .http_pool import HttpConnectionPool
+from .rate_limit import RateLimitBudget
+from .sync_jobs import SyncJobRunner
+from .pipeline_service import PipelineService
+
+
+class ServiceContainer:
+
+    def __init__(self, config):
+        self.config = config
+        self._lock = threading.Lock()
+        self._pipeline_service: PipelineService | None = None
+        self.sync_jobs = SyncJobRunner(lambda: self.pipeline_service)
+
+    def _build_pipeline_service(self) -> PipelineService:
+        connections = SQLiteConnectionManager(
+            storage_path=self.config["RUNS_STORAGE_PATH"],
+            cache_size_kb=self.config["SQLITE_CACHE_SIZE_KB"],
+            mmap_size_bytes=self.config["SQLITE_MMAP_SIZE_BYTES"],
+            pool_size=self.config["SQLITE_POOL_SIZE"],
+        )
+        repository = WorkflowRunRepository(
+            storage_path=self.config["RUNS_STORAGE_PATH"],
+            legacy_json_path=self.config.get("RUNS_LEGACY_JSON_PATH"),
+            connections=connections,
+        )
+        github = GithubService(
+            api_base=self.config["GITHUB_API_BASE"],
+            owner=self.config["GITHUB_OWNER"],
+            repo=self.config["GITHUB_REPO"],
+            token=self.config["GITHUB_TOKEN"],
+            max_workers=self.config["SYNC_ARTIFACT_CONCURRENCY"],
+            summary_cache=ArtifactSummaryCache(connections),
+            validator_cache=HttpValidatorCache(
+                connections, max_entries=self.config["HTTP_VALIDATOR_CACHE_MAX_ENTRIES"]
+            ),
+            http_pool=HttpConnectionPool(
+                max_per_host=self.config["GITHUB_HTTP_POOL_SIZE"],
+                timeout=self.config["GITHUB_HTTP_TIMEOUT_SECONDS"],
+            ),
+            rate_limit=RateLimitBudget(reserve=self.config["GITHUB_RATE_LIMIT_RESERVE"]),
+            archive_limits=ArchiveLimits(
+                max_archive_bytes=self.config["ARTIFACT_MAX_ARCHIVE_BYTES"],
+                max_member_bytes=self.config["ARTIFACT_MAX_MEMBER_BYTES"],
+                max_compression_ratio=self.config["ARTIFACT_MAX_COMPRESSION_RATIO"],
+                spool_memory_bytes=self.config["ARTIFACT_SPOOL_MEMORY_BYTES"],
+                stream_member_bytes=self.config["ARTIFACT_STREAM_MEMBER_BYTES"],
+            ),
+            parse_pool=ArtifactParsePool(
+                workers=self.config["ARTIFACT_PARSE_WORKERS"],
+                min_archive_bytes=self.config["ARTIFACT_PARSE_MIN_ARCHIVE_BYTES"],
+            ),
+        )
+        return PipelineService(
+            repository=repository,
+            github=github,
+            max_pages=self.config["SYNC_MAX_PAGES"],
+            sync_lease=SyncLease(connections, ttl_seconds=self.config["SYNC_LEASE_TTL_SECONDS"]),
+        )
+
+    @property
+    def started(self) -> bool:
+        return self._pipeline_service is not None
+
+    def startup(self) -> PipelineService:
+        service = self._pipeline_service
+        if service is not None:
+            return service
+        with self._lock:
+            if self._pipeline_service is None:
+                self._pipeline_service = self._build_pipeline_service()
+            return self._pipeline_service
+
+    def shutdown(self) -> None:
+        self.sync_jobs.shutdown()
+        with self._lock:
+            service, self._pipeline_service = self._pipeline_service, None
+        if service is not None:
+            service.github.http_pool.close()
+            service.github.parse_pool.close()
+            service.repository.close()
+
+    @property
+    def pipeline_service(self) -> PipelineService:
+        return self.startup()
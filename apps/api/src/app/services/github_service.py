@@ -1,62 +1,237 @@
+import hashlib
+import http.client
 import json
-from typing import Any
-from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
+import time
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import SpooledTemporaryFile
+from typing import IO, Any, BinaryIO
+from urllib.parse import urlencode, urljoin, urlsplit
 
-from .artifact_summary import summarize_artifact_archives
+from .artifact_parse_pool import ArtifactParsePool, PendingArchive
+from .artifact_summary import ArchiveLimits, ArtifactSummaryBuilder
+from .http_pool import HttpConnectionPool, HttpResponse, ResponseTooLarge
+from .rate_limit import RateLimitBudget
+
+MAX_REDIRECTS = 3
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+MAX_RATE_LIMIT_RETRIES = 3
+MAX_RETRY_WAIT_SECONDS = 60
+PENDING_SUMMARY_STATUS = "pending"
 
 
 class GithubServiceError(Exception):
     pass
 
 
+class GithubNotModified(GithubServiceError):
+    pass
+
+
+class GithubRateLimited(GithubServiceError):
+    pass
+
+
+class GithubArtifactTooLarge(GithubServiceError):
+    pass
+
+
+def pending_summary() -> dict[str, Any]:
+    return {"status": PENDING_SUMMARY_STATUS}
+
+
+def is_pending_summary(summary: Any) -> bool:
+    return isinstance(summary, dict) and summary.get("status") == PENDING_SUMMARY_STATUS
+
+
+def _retry_after_seconds(response: HttpResponse, attempt: int) -> float | None:
+    # Primary limit exhaustion (403/429 with no remaining budget and no Retry-After) is not retried;
+    # secondary limits either send Retry-After or are backed off exponentially.
+    if response.status not in {403, 429}:
+        return None
+    retry_after = response.headers.get("Retry-After")
+    if retry_after is not None:
+        try:
+            return min(max(0.0, float(retry_after)), MAX_RETRY_WAIT_SECONDS)
+        except ValueError:
+            pass
+    if response.headers.get("X-RateLimit-Remaining") == "0":
+        return None
+    if response.status == 429 or b"secondary rate limit" in response.body.lower():
+        return min(float(2**attempt), MAX_RETRY_WAIT_SECONDS)
+    return None
+
+
+def _artifact_fingerprint(artifacts: list[dict[str, Any]]) -> str:
+    keys = sorted(
+        (artifact.get("id"), artifact.get("size_in_bytes"), artifact.get("updated_at"))
+        for artifact in artifacts
+    )
+    return hashlib.sha256(json.dumps(keys, default=str).encode("utf-8")).hexdigest()
+
+
 class GithubService:
-    def __init__(self, api_base: str, owner: str, repo: str, token: str = ""):
+    def __init__(
+        self,
+        api_base: str,
+        owner: str,
+        repo: str,
+        token: str = "",
+        max_workers: int = 4,
+        summary_cache=None,
+        validator_cache=None,
+        http_pool: HttpConnectionPool | None = None,
+        rate_limit: RateLimitBudget | None = None,
+        archive_limits: ArchiveLimits | None = None,
+        parse_pool: ArtifactParsePool | None = None,
+    ):
         self.api_base = api_base.rstrip("/")
         self.owner = owner
         self.repo = repo
         self.token = token
+        self.max_workers = max(1, max_workers)
+        # Optional store with get(run_id, fingerprint) / put(run_id, fingerprint, summary).
+        self.summary_cache = summary_cache
+        # Optional store with get(url) / put(url, etag, last_modified, body) for conditional GETs.
+        self.validator_cache = validator_cache
+        self.http_pool = http_pool or HttpConnectionPool(max_per_host=self.max_workers)
+        self.rate_limit = rate_limit or RateLimitBudget()
+        self.sleep = time.sleep
+        self.archive_limits = archive_limits or ArchiveLimits()
+        self.parse_pool = parse_pool or ArtifactParsePool()
 
-    def _build_request(self, url: str, accept: str = "application/vnd.github+json") -> Request:
+    def _headers(self, accept: str = "application/vnd.github+json") -> dict[str, str]:
         headers = {
             "Accept": accept,
             "User-Agent": "devsecops-lab-dashboard",
         }
         if self.token:
             headers["Authorization"] = f"Bearer {self.token}"
-        return Request(url, headers=headers, method="GET")
+        return headers
 
-    def _request_json(self, path: str) -> dict[str, Any]:
+    def _send_once(
+        self,
+        url: str,
+        headers: dict[str, str],
+        sink: BinaryIO | None = None,
+        max_bytes: int | None = None,
+    ) -> HttpResponse:
+        is_api = url.startswith(self.api_base)
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            if is_api and self.rate_limit.exhausted():
+                raise GithubRateLimited(f"GitHub rate limit exhausted: {url}")
+            try:
+                response = self.http_pool.request("GET", url, headers=headers, sink=sink, max_bytes=max_bytes)
+            except ResponseTooLarge as exc:
+                raise GithubArtifactTooLarge(f"GitHub response too large: {url}") from exc
+            except (OSError, http.client.HTTPException, ValueError) as exc:
+                raise GithubServiceError(f"Failed GitHub API request: {url}") from exc
+            if not is_api:
+                return response
+            self.rate_limit.update(response.headers)
+            wait = _retry_after_seconds(response, attempt)
+            if wait is None:
+                if response.status in {403, 429} and self.rate_limit.exhausted():
+                    raise GithubRateLimited(f"GitHub rate limit exhausted: {url}")
+                return response
+            if attempt < MAX_RATE_LIMIT_RETRIES:
+                self.sleep(wait)
+        raise GithubRateLimited(f"GitHub secondary rate limit persisted: {url}")
+
+    def _send(
+        self,
+        url: str,
+        headers: dict[str, str],
+        sink: BinaryIO | None = None,
+        max_bytes: int | None = None,
+    ) -> HttpResponse:
+        for _ in range(MAX_REDIRECTS + 1):
+            response = self._send_once(url, headers, sink=sink, max_bytes=max_bytes)
+            location = response.headers.get("Location")
+            if response.status not in REDIRECT_STATUSES or not location:
+                return response
+            next_url = urljoin(url, location)
+            # Artifact downloads redirect to a signed blob URL; never forward the token off-host.
+            if urlsplit(next_url).netloc != urlsplit(url).netloc:
+                headers = {name: value for name, value in headers.items() if name != "Authorization"}
+            url = next_url
+        raise GithubServiceError(f"Too many redirects for GitHub API request: {url}")
+
+    def _request_json(self, path: str) -> tuple[dict[str, Any], bool, Any]:
         url = f"{self.api_base}{path}"
-        req = self._build_request(url=url)
+        headers = self._headers()
+        cached = self.validator_cache.get(url) if self.validator_cache is not None else None
+        if cached:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+        response = self._send(url, headers)
+        if response.status == 304 and cached:
+            try:
+                return json.loads(cached["body"]), True, {}
+            except json.JSONDecodeError:
+                pass
+        if response.status != 200:
+            raise GithubServiceError(f"Failed GitHub API request: {url} (HTTP {response.status})")
         try:
-            with urlopen(req, timeout=15) as response:
-                return json.loads(response.read().decode("utf-8"))
-        except (HTTPError, URLError, json.JSONDecodeError) as exc:
+            body = response.body.decode("utf-8")
+            payload = json.loads(body)
+        except (UnicodeDecodeError, json.JSONDecodeError) as exc:
             raise GithubServiceError(f"Failed GitHub API request: {url}") from exc
 
-    def _request_bytes(self, path: str, accept: str = "application/octet-stream") -> bytes:
+        etag = response.headers.get("ETag", "") or ""
+        last_modified = response.headers.get("Last-Modified", "") or ""
+        if self.validator_cache is not None and (etag or last_modified):
+            self.validator_cache.put(url, etag, last_modified, body)
+        return payload, False, response.headers
+
+    def _request_file(self, path: str, accept: str = "application/octet-stream") -> IO[bytes]:
         url = f"{self.api_base}{path}"
-        req = self._build_request(url=url, accept=accept)
+        # Bodies stay in memory up to spool_memory_bytes and roll over to a temp file beyond that.
+        spool = SpooledTemporaryFile(max_size=self.archive_limits.spool_memory_bytes)
         try:
-            with urlopen(req, timeout=20) as response:
-                return response.read()
-        except (HTTPError, URLError) as exc:
-            raise GithubServiceError(f"Failed GitHub API request: {url}") from exc
+            response = self._send(
+                url,
+                self._headers(accept=accept),
+                sink=spool,
+                max_bytes=self.archive_limits.max_archive_bytes,
+            )
+            if response.status != 200:
+                raise GithubServiceError(f"Failed GitHub API request: {url} (HTTP {response.status})")
+        except BaseException:
+            spool.close()
+            raise
+        spool.seek(0)
+        return spool
 
     def list_workflow_runs(self, per_page: int = 30) -> list[dict[str, Any]]:
-        path = (
-            f"/repos/{self.owner}/{self.repo}/actions/runs"
-            f"?per_page={per_page}"
-        )
-        payload = self._request_json(path)
+        runs, _ = self.list_workflow_runs_page(per_page=per_page)
+        return runs
+
+    def list_workflow_runs_page(
+        self,
+        per_page: int = 30,
+        page: int = 1,
+        created_since: str = "",
+    ) -> tuple[list[dict[str, Any]], bool]:
+        query = {"per_page": per_page}
+        if page > 1:
+            query["page"] = page
+        if created_since:
+            query["created"] = f">={created_since}"
+        path = f"/repos/{self.owner}/{self.repo}/actions/runs?{urlencode(query)}"
+        payload, not_modified, headers = self._request_json(path)
+        if not_modified and page == 1:
+            raise GithubNotModified(f"Workflow runs not modified: {path}")
         runs = payload.get("workflow_runs", [])
         if not isinstance(runs, list):
-            return []
-        return runs
+            return [], False
+        if not_modified:
+            return runs, len(runs) >= per_page
+        return runs, 'rel="next"' in (headers.get("Link", "") or "")
 
     def list_run_artifacts(self, run_id: int) -> list[dict[str, Any]]:
-        payload = self._request_json(
+        payload, _, _ = self._request_json(
             f"/repos/{self.owner}/{self.repo}/actions/runs/{run_id}/artifacts"
         )
         artifacts = payload.get("artifacts", [])
@@ -64,31 +239,98 @@ class GithubService:
             return []
         return artifacts
 
-    def download_artifact_zip(self, artifact_id: int) -> bytes:
-        return self._request_bytes(
+    def download_artifact_zip(self, artifact_id: int) -> IO[bytes]:
+        return self._request_file(
             f"/repos/{self.owner}/{self.repo}/actions/artifacts/{artifact_id}/zip"
         )
 
     def build_run_summary(self, run_id: int) -> dict[str, Any]:
-        archives: list[tuple[str, bytes]] = []
+        # Runs that do not fit in the remaining budget are deferred to a later sync cycle.
+        if not self.rate_limit.can_spend(1):
+            return pending_summary()
         try:
             artifacts = self.list_run_artifacts(run_id=run_id)
         except GithubServiceError:
-            return {}
-
-        for artifact in artifacts:
-            if not isinstance(artifact, dict):
-                continue
-            artifact_id = artifact.get("id")
-            if not isinstance(artifact_id, int):
-                continue
-            is_expired = bool(artifact.get("expired", False))
-            if is_expired:
-                continue
-            artifact_name = str(artifact.get("name", f"artifact-{artifact_id}"))
-            try:
-                archive_bytes = self.download_artifact_zip(artifact_id=artifact_id)
-            except GithubServiceError:
-                continue
-            archives.append((artifact_name, archive_bytes))
-        return summarize_artifact_archives(archives)
+            return pending_summary()
+
+        live_artifacts = [
+            artifact
+            for artifact in artifacts
+            if isinstance(artifact, dict)
+            and isinstance(artifact.get("id"), int)
+            and not bool(artifact.get("expired", False))
+        ]
+        fingerprint = _artifact_fingerprint(live_artifacts)
+        if self.summary_cache is not None:
+            cached = self.summary_cache.get(run_id, fingerprint)
+            if cached is not None:
+                return cached
+        if not self.rate_limit.can_spend(len(live_artifacts)):
+            return pending_summary()
+
+        # Archives are downloaded one at a time. Inline parsing folds each into the summary before
+        # the next download; with a parse pool at most `workers` archive copies are in flight, and
+        # results are merged in artifact order either way.
+        builder = ArtifactSummaryBuilder(self.archive_limits)
+        in_flight: list[PendingArchive] = []
+        max_in_flight = max(1, self.parse_pool.workers)
+        complete = True
+        try:
+            for artifact in live_artifacts:
+                artifact_id = artifact["id"]
+                artifact_name = str(artifact.get("name", f"artifact-{artifact_id}"))
+                size = artifact.get("size_in_bytes")
+                if isinstance(size, int) and size > self.archive_limits.max_archive_bytes:
+                    builder.add_skipped_artifact(artifact_name)
+                    continue
+                try:
+                    archive = self.download_artifact_zip(artifact_id=artifact_id)
+                except GithubRateLimited:
+                    return pending_summary()
+                except GithubArtifactTooLarge:
+                    builder.add_skipped_artifact(artifact_name)
+                    continue
+                except GithubServiceError:
+                    complete = False
+                    continue
+                with archive:
+                    in_flight.append(self.parse_pool.submit(artifact_name, archive, self.archive_limits))
+                while len(in_flight) >= max_in_flight:
+                    builder.add_analysis(in_flight.pop(0).result())
+            while in_flight:
+                builder.add_analysis(in_flight.pop(0).result())
+        except OSError:
+            # Spooling or handing an archive to a parse worker failed; nothing about the artifact
+            # itself is known yet, so retry it later.
+            return pending_summary()
+        finally:
+            # Jobs abandoned by an early return still own a temp file.
+            for pending in in_flight:
+                pending.close()
+        if not complete:
+            # A partial summary would read as "no findings" and settle the run; stay pending so the
+            # next sync retries the failed downloads.
+            return pending_summary()
+        summary = builder.summary()
+        if self.summary_cache is not None:
+            self.summary_cache.put(run_id, fingerprint, summary)
+        return summary
+
+    def build_run_summaries(self, run_ids: list[int]) -> dict[int, dict[str, Any]]:
+        unique_ids = list(dict.fromkeys(run_ids))
+        workers = min(self.max_workers, len(unique_ids))
+        if workers <= 1:
+            return {run_id: self._summary_or_pending(run_id) for run_id in unique_ids}
+
+        # Runs are summarized in parallel; each worker is bounded by the
+        # per-request HTTP timeout, so one slow artifact only holds its own
+        # worker. Results are collected in input order to stay deterministic.
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="github-artifacts") as pool:
+            futures = [(run_id, pool.submit(self._summary_or_pending, run_id)) for run_id in unique_ids]
+            return {run_id: future.result() for run_id, future in futures}
+
+    def _summary_or_pending(self, run_id: int) -> dict[str, Any]:
+        try:
+            return self.build_run_summary(run_id=run_id)
+        except GithubServiceError:
+            return pending_summary()
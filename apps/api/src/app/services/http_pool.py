@@ -0,0 +1,127 @@
+import http.client
+import shutil
+import threading
+from dataclasses import dataclass
+from email.message import Message
+from typing import BinaryIO
+from urllib.parse import urlsplit
+
+STREAM_CHUNK_BYTES = 64 * 1024
+
+# Errors that mean a kept-alive socket was closed by the server between requests.
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+
+class ResponseTooLarge(Exception):
+    pass
+
+
+@dataclass
+class HttpResponse:
+    status: int
+    headers: Message
+    body: bytes
+
+
+def _copy_limited(response: http.client.HTTPResponse, sink: BinaryIO, max_bytes: int | None) -> None:
+    if max_bytes is None:
+        shutil.copyfileobj(response, sink, STREAM_CHUNK_BYTES)
+        return
+    length = response.getheader("Content-Length")
+    if length is not None and length.isdigit() and int(length) > max_bytes:
+        raise ResponseTooLarge(f"Response body of {length} bytes exceeds {max_bytes}")
+    copied = 0
+    while True:
+        chunk = response.read(STREAM_CHUNK_BYTES)
+        if not chunk:
+            return
+        copied += len(chunk)
+        if copied > max_bytes:
+            raise ResponseTooLarge(f"Response body exceeds {max_bytes} bytes")
+        sink.write(chunk)
+
+
+class HttpConnectionPool:
+    def __init__(self, max_per_host: int = 8, timeout: float = 20.0):
+        self.max_per_host = max(1, max_per_host)
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._idle: dict[tuple[str, str, int], list[http.client.HTTPConnection]] = {}
+
+    @staticmethod
+    def _host_key(url: str) -> tuple[tuple[str, str, int], str]:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in {"http", "https"} or not parts.hostname:
+            raise ValueError(f"Unsupported URL: {url}")
+        port = parts.port or (443 if scheme == "https" else 80)
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+        return (scheme, parts.hostname, port), target
+
+    def _checkout(self, key: tuple[str, str, int]) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        scheme, host, port = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout), False
+        return http.client.HTTPConnection(host, port, timeout=self.timeout), False
+
+    def _checkin(self, key: tuple[str, str, int], conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        sink: BinaryIO | None = None,
+        max_bytes: int | None = None,
+    ) -> HttpResponse:
+        # With a sink, a 200 body is copied into it in chunks instead of being returned in memory.
+        key, target = self._host_key(url)
+        while True:
+            conn, reused = self._checkout(key)
+            try:
+                conn.request(method, target, headers=headers or {})
+                response = conn.getresponse()
+                if sink is not None and response.status == 200:
+                    body = b""
+                    sink.seek(0)
+                    sink.truncate()
+                    _copy_limited(response, sink, max_bytes)
+                else:
+                    body = response.read()
+            except _STALE_CONNECTION_ERRORS:
+                conn.close()
+                if reused:
+                    continue
+                raise
+            except BaseException:
+                conn.close()
+                raise
+            if response.will_close:
+                conn.close()
+            else:
+                self._checkin(key, conn)
+            return HttpResponse(status=response.status, headers=response.headers, body=body)
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn in connections:
+                conn.close()
@@ -1,14 +1,22 @@
 from collections import Counter
-from datetime import date, datetime, timedelta, timezone
+from collections.abc import Callable, Iterable, Iterator
+from datetime import timedelta
 from typing import Any
 
 from ..models.workflow_run import WorkflowRun
-from ..repositories.workflow_run_repository import WorkflowRunRepository
-from .github_service import GithubService
+from ..repositories.run_stream import iter_ndjson, iter_ndjson_lines
+from ..repositories.sync_lease import SyncLease
+from ..repositories.workflow_run_repository import RUN_LIST_FIELDS, WorkflowRunRepository
+from .github_service import GithubNotModified, GithubService, is_pending_summary, pending_summary
 
 EXCLUDED_WORKFLOWS = {"Dashboard Sync on Workflow Completion"}
 SECURITY_TOOLS = ("trivy", "bandit", "semgrep", "pip_audit", "gitleaks", "zap")
 SEVERITIES = ("critical", "high", "medium", "low", "unknown")
+SUPPLY_CHAIN_FLAGS = ("sbom_generated", "cosign_signed", "cosign_verified")
+SYNC_CURSOR_KEY = "runs_created_cursor"
+SYNC_WALK_KEY = "runs_incremental_walk"
+SYNC_BACKFILL_KEY = "runs_backfill_page"
+SYNC_MODES = ("incremental", "backfill")
 
 
 def _category_from_name(workflow_name: str) -> str:
@@ -28,6 +36,7 @@ def _blank_security_summary() -> dict[str, Any]:
         "tool_totals": {tool: 0 for tool in SECURITY_TOOLS},
         "tool_severity": {tool: {severity: 0 for severity in SEVERITIES} for tool in SECURITY_TOOLS},
         "secret_leak_detected": False,
+        "skipped_artifact_runs": 0,
         "supply_chain": {
             "sbom_generated": False,
             "cosign_signed": False,
@@ -44,67 +53,41 @@ def _as_int(value: Any) -> int:
     return 0
 
 
-def _build_security_summary(runs: list[dict[str, Any]]) -> dict[str, Any]:
+def _build_security_summary(
+    finding_totals: list[tuple[str, str, int]],
+    supply_chain_flags: dict[str, bool],
+    skipped_artifact_runs: int = 0,
+) -> dict[str, Any]:
     summary = _blank_security_summary()
-    for run in runs:
-        summary_json = run.get("summary_json", {})
-        if not isinstance(summary_json, dict):
+    summary["skipped_artifact_runs"] = skipped_artifact_runs
+    for tool, severity, total in finding_totals:
+        numeric = _as_int(total)
+        if numeric <= 0:
             continue
+        summary["severity_totals"][severity] += numeric
+        summary["tool_severity"][tool][severity] += numeric
+        summary["tool_totals"][tool] += numeric
 
-        tools = summary_json.get("tools", {})
-        if isinstance(tools, dict):
-            for tool, severities in tools.items():
-                if tool not in SECURITY_TOOLS or not isinstance(severities, dict):
-                    continue
-                for severity, count in severities.items():
-                    if severity not in SEVERITIES:
-                        continue
-                    numeric = _as_int(count)
-                    if numeric <= 0:
-                        continue
-                    summary["severity_totals"][severity] += numeric
-                    summary["tool_severity"][tool][severity] += numeric
-                    summary["tool_totals"][tool] += numeric
-
-        supply_chain = summary_json.get("supply_chain", {})
-        if isinstance(supply_chain, dict):
-            for key in ("sbom_generated", "cosign_signed", "cosign_verified"):
-                if bool(supply_chain.get(key)):
-                    summary["supply_chain"][key] = True
+    for key in SUPPLY_CHAIN_FLAGS:
+        if supply_chain_flags.get(key):
+            summary["supply_chain"][key] = True
 
     gitleaks_total = summary["tool_totals"]["gitleaks"]
     summary["secret_leak_detected"] = gitleaks_total > 0
     return summary
 
 
-def _extract_run_date(run: dict[str, Any]) -> date | None:
-    for field in ("started_at", "synced_at", "completed_at"):
-        value = run.get(field)
-        if not isinstance(value, str) or len(value) < 10:
-            continue
-        try:
-            return datetime.fromisoformat(value.replace("Z", "+00:00")).date()
-        except ValueError:
-            try:
-                return date.fromisoformat(value[:10])
-            except ValueError:
-                continue
-    return None
-
-
-def _extract_run_datetime(run: dict[str, Any]) -> datetime | None:
-    for field in ("started_at", "completed_at", "synced_at"):
-        value = run.get(field)
-        if not isinstance(value, str) or not value.strip():
-            continue
-        try:
-            dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            return dt
-        except ValueError:
-            continue
-    return None
+def _is_settled(raw: dict[str, Any], stored: dict[str, Any]) -> bool:
+    # GitHub only sets conclusion once a run has completed; a completed run whose
+    # update time matches the stored row cannot have new artifacts.
+    conclusion = raw.get("conclusion")
+    if not conclusion:
+        return False
+    return (
+        stored.get("conclusion") == conclusion
+        and stored.get("completed_at") == (raw.get("updated_at") or "")
+        and not is_pending_summary(stored.get("summary_json"))
+    )
 
 
 def _blank_deployment_summary() -> dict[str, Any]:
@@ -123,10 +106,23 @@ def _blank_deployment_summary() -> dict[str, Any]:
     }
 
 
+def _sync_result(totals: Counter, mode: str, pages: int, **extra: Any) -> dict[str, Any]:
+    result = {key: totals.get(key, 0) for key in ("synced", "summarized", "inserted", "updated", "unchanged")}
+    return {**result, "mode": mode, "pages": pages, "not_modified": False, **extra}
+
+
 class PipelineService:
-    def __init__(self, repository: WorkflowRunRepository, github: GithubService):
+    def __init__(
+        self,
+        repository: WorkflowRunRepository,
+        github: GithubService,
+        max_pages: int = 10,
+        sync_lease: SyncLease | None = None,
+    ):
         self.repository = repository
         self.github = github
+        self.max_pages = max(1, max_pages)
+        self.sync_lease = sync_lease
 
     def list_runs(
         self,
@@ -134,25 +130,38 @@ class PipelineService:
         page: int = 1,
         category: str = "",
         branch: str = "",
+        fields: tuple[str, ...] = RUN_LIST_FIELDS,
     ) -> tuple[list[dict[str, Any]], int, int]:
-        runs = self.repository.list_runs()
         normalized_category = category.strip().lower()
-        normalized_branch = branch.strip().lower()
-        if normalized_category:
-            runs = [run for run in runs if str(run.get("category", "")).lower() == normalized_category]
-        if normalized_branch:
-            runs = [run for run in runs if str(run.get("branch", "")).lower() == normalized_branch]
+        normalized_branch = branch.strip()
         safe_limit = max(1, min(limit, 100))
         safe_page = max(1, page)
-        total = len(runs)
+        total = self.repository.count_runs(category=normalized_category, branch=normalized_branch)
         total_pages = max(1, (total + safe_limit - 1) // safe_limit)
-        start = (safe_page - 1) * safe_limit
-        end = start + safe_limit
-        return runs[start:end], total, total_pages
+        runs = self.repository.list_runs(
+            category=normalized_category,
+            branch=normalized_branch,
+            limit=safe_limit,
+            offset=(safe_page - 1) * safe_limit,
+            fields=fields,
+        )
+        return runs, total, total_pages
+
+    def get_run(self, run_id: int) -> dict[str, Any] | None:
+        return self.repository.get_run(run_id)
+
+    def export_runs(self) -> Iterator[str]:
+        return iter_ndjson_lines(self.repository.iter_runs())
+
+    def import_runs(self, lines: Iterable[str | bytes]) -> dict[str, int]:
+        invalid_lines: list[int] = []
+        result = self.repository.import_runs(iter_ndjson(lines, errors=invalid_lines))
+        result["skipped"] += len(invalid_lines)
+        return result
 
     def summary(self) -> dict[str, Any]:
-        runs = self.repository.list_runs()
-        if not runs:
+        total_runs = self.repository.count_runs()
+        if not total_runs:
             return {
                 "total_runs": 0,
                 "status_counts": {},
@@ -161,17 +170,20 @@ class PipelineService:
                 "security_summary": _blank_security_summary(),
             }
 
-        status_counts = Counter((r.get("conclusion") or "unknown") for r in runs)
-        recent_failures = [r for r in runs if r.get("conclusion") == "failure"][:5]
+        status_counts: Counter[str] = Counter()
+        for conclusion, count in self.repository.conclusion_counts().items():
+            status_counts[conclusion or "unknown"] += count
+        recent_failures = self.repository.list_runs(
+            conclusion="failure",
+            limit=5,
+            fields=RUN_LIST_FIELDS,
+        )
 
         def latest_for(category: str) -> str:
-            for run in runs:
-                if run.get("category") == category:
-                    return run.get("conclusion", "unknown")
-            return "unknown"
+            return self.repository.latest_conclusion(category) or "unknown"
 
         return {
-            "total_runs": len(runs),
+            "total_runs": total_runs,
             "status_counts": dict(status_counts),
             "category_status": {
                 "ci": latest_for("ci"),
@@ -179,19 +191,17 @@ class PipelineService:
                 "cd": latest_for("cd"),
             },
             "recent_failures": recent_failures,
-            "security_summary": _build_security_summary(runs),
+            "security_summary": _build_security_summary(
+                self.repository.finding_totals(tools=SECURITY_TOOLS, severities=SEVERITIES),
+                self.repository.supply_chain_flags(SUPPLY_CHAIN_FLAGS),
+                self.repository.count_skipped_artifact_runs(),
+            ),
         }
 
     def deployment_summary(self) -> dict[str, Any]:
-        runs = self.repository.list_runs()
-        cd_runs = [run for run in runs if run.get("category") == "cd"]
-        if not cd_runs:
+        latest = self.repository.latest_run(category="cd")
+        if latest is None:
             return _blank_deployment_summary()
-
-        latest = max(
-            cd_runs,
-            key=lambda run: _extract_run_datetime(run) or datetime.min.replace(tzinfo=timezone.utc),
-        )
         summary = _blank_deployment_summary()
         summary["has_cd_data"] = True
         summary["latest_cd_run"] = {
@@ -227,16 +237,11 @@ class PipelineService:
         return summary
 
     def security_trends(self, days: int = 14) -> dict[str, Any]:
-        safe_days = max(1, min(days, 90))
-        runs = self.repository.list_runs()
-        if not runs:
-            return {"days": safe_days, "points": []}
-
-        run_dates = [d for d in (_extract_run_date(run) for run in runs) if d is not None]
-        if not run_dates:
+        safe_days = max(1, min(days, 365))
+        end_day = self.repository.latest_run_day()
+        if end_day is None:
             return {"days": safe_days, "points": []}
 
-        end_day = max(run_dates)
         start_day = end_day - timedelta(days=safe_days - 1)
         points_by_date: dict[str, dict[str, Any]] = {}
 
@@ -249,45 +254,171 @@ class PipelineService:
                 "severity_totals": {severity: 0 for severity in SEVERITIES},
             }
 
-        for run in runs:
-            run_day = _extract_run_date(run)
-            if run_day is None:
-                continue
-            day_key = run_day.isoformat()
-            point = points_by_date.get(day_key)
+        for day, severity, count in self.repository.daily_security_rollup(
+            start_day=start_day.isoformat(),
+            end_day=end_day.isoformat(),
+            severities=SEVERITIES,
+        ):
+            point = points_by_date.get(day)
             if point is None:
                 continue
-            summary_json = run.get("summary_json", {})
-            if not isinstance(summary_json, dict):
-                continue
-            tools = summary_json.get("tools", {})
-            if not isinstance(tools, dict):
-                continue
-            for severities in tools.values():
-                if not isinstance(severities, dict):
-                    continue
-                for severity, count in severities.items():
-                    if severity not in SEVERITIES:
-                        continue
-                    numeric = _as_int(count)
-                    if numeric <= 0:
-                        continue
-                    point["severity_totals"][severity] += numeric
-                    point["total_findings"] += numeric
+            numeric = _as_int(count)
+            point["severity_totals"][severity] += numeric
+            point["total_findings"] += numeric
 
         points = [points_by_date[key] for key in sorted(points_by_date.keys())]
         return {"days": safe_days, "points": points}
 
-    def sync(self, per_page: int = 30) -> dict[str, Any]:
-        raw_runs = self.github.list_workflow_runs(per_page=per_page)
+    def _sync_runs(self, listed: list[dict[str, Any]]) -> dict[str, int]:
+        raw_runs = [raw for raw in listed if raw.get("name", "") not in EXCLUDED_WORKFLOWS]
+        run_ids = [raw["id"] for raw in raw_runs if isinstance(raw.get("id"), int)]
+        stored = self.repository.get_runs(run_ids, fields=("conclusion", "completed_at", "summary_json"))
+        reused = {
+            raw["id"]: stored[raw["id"]]["summary_json"]
+            for raw in raw_runs
+            if raw.get("id") in stored and _is_settled(raw, stored[raw["id"]])
+        }
+        summaries = self.github.build_run_summaries([run_id for run_id in run_ids if run_id not in reused])
+        # Runs whose artifacts could not be fetched stay pending and are counted in pending_summaries.
+        summarized = sum(1 for summary in summaries.values() if not is_pending_summary(summary))
+        summaries.update(reused)
+
         transformed: list[dict[str, Any]] = []
         for raw in raw_runs:
-            if raw.get("name", "") in EXCLUDED_WORKFLOWS:
-                continue
             run_id = raw.get("id")
             if isinstance(run_id, int):
-                raw["summary_json"] = self.github.build_run_summary(run_id=run_id)
+                raw["summary_json"] = summaries.get(run_id, pending_summary())
             raw["category"] = _category_from_name(raw.get("name", ""))
             transformed.append(WorkflowRun.from_github_run(raw).to_dict())
-        self.repository.save_runs(transformed)
-        return {"synced": len(transformed)}
+        counts = self.repository.upsert_runs(transformed)
+        return {"synced": len(transformed), "summarized": summarized, **counts}
+
+    def _resume_pending_summaries(self, limit: int = 50) -> dict[str, int]:
+        return self.summarize_runs(self.repository.pending_summary_run_ids(limit=limit))
+
+    def summarize_runs(self, run_ids: list[int]) -> dict[str, int]:
+        if not run_ids:
+            return {}
+        summaries = self.github.build_run_summaries(run_ids)
+        stored = self.repository.get_runs(run_ids)
+        runs = [
+            {**stored[run_id], "summary_json": summaries[run_id]}
+            for run_id in run_ids
+            if run_id in stored and not is_pending_summary(summaries.get(run_id))
+        ]
+        counts = self.repository.upsert_runs(runs) if runs else {}
+        return {"summarized": len(runs), "updated": counts.get("updated", 0)}
+
+    def ingest_workflow_run(self, raw: dict[str, Any]) -> dict[str, Any]:
+        run_id = raw.get("id")
+        if not isinstance(run_id, int) or raw.get("name", "") in EXCLUDED_WORKFLOWS:
+            return {"run_id": run_id, "ignored": True, "needs_summary": False}
+        stored = self.repository.get_runs([run_id], fields=("conclusion", "completed_at", "summary_json"))
+        previous = stored.get(run_id)
+        needs_summary = False
+        if previous is not None and _is_settled(raw, previous):
+            summary = previous["summary_json"]
+        elif raw.get("conclusion"):
+            # Artifacts are fetched off the request path; the run is visible right away as pending.
+            summary = pending_summary()
+            needs_summary = True
+        else:
+            summary = previous["summary_json"] if previous is not None else {}
+        run = {**raw, "summary_json": summary, "category": _category_from_name(raw.get("name", ""))}
+        counts = self.repository.upsert_runs([WorkflowRun.from_github_run(run).to_dict()])
+        return {"run_id": run_id, "ignored": False, "needs_summary": needs_summary, **counts}
+
+    def sync(
+        self,
+        per_page: int = 30,
+        mode: str = "incremental",
+        progress: Callable[[dict[str, Any]], None] | None = None,
+    ) -> dict[str, Any]:
+        self.github.rate_limit.begin_cycle()
+        if mode == "backfill":
+            result = self._sync_backfill(per_page, progress)
+        else:
+            # Runs deferred by the rate-limit budget in earlier cycles get the budget first, and are
+            # retried even when the run listing itself is unchanged.
+            resumed = self._resume_pending_summaries()
+            result = self._sync_incremental(per_page, progress)
+            result["summarized"] += resumed.get("summarized", 0)
+            result["updated"] += resumed.get("updated", 0)
+            if resumed.get("updated"):
+                result["not_modified"] = False
+        result["per_page"] = per_page
+        result["pending_summaries"] = self.repository.count_pending_summaries()
+        result["active_runs"] = self.repository.count_active_runs()
+        result["rate_limit"] = self.github.rate_limit.snapshot()
+        return result
+
+    def _sync_incremental(
+        self,
+        per_page: int,
+        progress: Callable[[dict[str, Any]], None] | None = None,
+    ) -> dict[str, Any]:
+        # The cursor only moves once a walk over every page newer than it has finished, so an
+        # interrupted or page-capped walk resumes where it stopped instead of leaving a gap.
+        cursor = self.repository.get_sync_state(SYNC_CURSOR_KEY) or ""
+        walk = self.repository.get_sync_state(SYNC_WALK_KEY) or {}
+        page = int(walk.get("page", 1))
+        newest = walk.get("newest", "")
+        oldest_open = walk.get("oldest_open", "")
+        max_pages = self.max_pages if cursor else 1
+
+        totals: Counter = Counter()
+        pages = 0
+        has_next = False
+        while pages < max_pages:
+            try:
+                listed, has_next = self.github.list_workflow_runs_page(
+                    per_page=per_page, page=page, created_since=cursor
+                )
+            except GithubNotModified:
+                return _sync_result(totals, mode="incremental", pages=0, not_modified=True)
+            totals.update(self._sync_runs(listed))
+            for raw in listed:
+                created_at = raw.get("created_at") or ""
+                if not created_at:
+                    continue
+                newest = max(newest, created_at)
+                if not raw.get("conclusion"):
+                    oldest_open = min(oldest_open, created_at) if oldest_open else created_at
+            pages += 1
+            page += 1
+            if progress is not None:
+                progress({"pages": pages, **totals})
+            if not has_next:
+                break
+
+        if has_next and cursor:
+            self.repository.set_sync_state(
+                SYNC_WALK_KEY, {"page": page, "newest": newest, "oldest_open": oldest_open}
+            )
+        else:
+            self.repository.set_sync_state(SYNC_CURSOR_KEY, oldest_open or newest or cursor or None)
+            self.repository.set_sync_state(SYNC_WALK_KEY, None)
+        return _sync_result(totals, mode="incremental", pages=pages)
+
+    def _sync_backfill(
+        self,
+        per_page: int,
+        progress: Callable[[dict[str, Any]], None] | None = None,
+    ) -> dict[str, Any]:
+        page = int(self.repository.get_sync_state(SYNC_BACKFILL_KEY) or 1)
+        totals: Counter = Counter()
+        pages = 0
+        has_next = True
+        while pages < self.max_pages and has_next:
+            try:
+                listed, has_next = self.github.list_workflow_runs_page(per_page=per_page, page=page)
+            except GithubNotModified:
+                listed, has_next = [], True
+            totals.update(self._sync_runs(listed))
+            pages += 1
+            page += 1
+            if progress is not None:
+                progress({"pages": pages, **totals})
+
+        self.repository.set_sync_state(SYNC_BACKFILL_KEY, page if has_next else None)
+        return _sync_result(totals, mode="backfill", pages=pages, backfill_complete=not has_next)
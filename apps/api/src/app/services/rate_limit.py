@@ -0,0 +1,67 @@
+import threading
+import time
+from typing import Any
+
+
+def _header_int(headers: Any, name: str) -> int | None:
+    value = headers.get(name) if headers is not None else None
+    if value is None:
+        return None
+    try:
+        return int(str(value).strip())
+    except ValueError:
+        return None
+
+
+class RateLimitBudget:
+    def __init__(self, reserve: int = 100, clock=time.time):
+        self.reserve = max(0, reserve)
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.limit: int | None = None
+        self.remaining: int | None = None
+        self.reset_at: int | None = None
+        self.requests = 0
+
+    def update(self, headers: Any) -> None:
+        remaining = _header_int(headers, "X-RateLimit-Remaining")
+        limit = _header_int(headers, "X-RateLimit-Limit")
+        reset_at = _header_int(headers, "X-RateLimit-Reset")
+        with self._lock:
+            self.requests += 1
+            if remaining is not None:
+                self.remaining = remaining
+            if limit is not None:
+                self.limit = limit
+            if reset_at is not None:
+                self.reset_at = reset_at
+
+    def _remaining_now(self) -> int | None:
+        if self.remaining is None:
+            return None
+        if self.reset_at is not None and self.clock() >= self.reset_at:
+            return None
+        return self.remaining
+
+    def exhausted(self) -> bool:
+        with self._lock:
+            return self._remaining_now() == 0
+
+    def can_spend(self, cost: int = 1) -> bool:
+        # The reserve keeps enough budget for run listings once artifact work is deferred.
+        with self._lock:
+            remaining = self._remaining_now()
+            return remaining is None or remaining - cost >= self.reserve
+
+    def begin_cycle(self) -> None:
+        with self._lock:
+            self.requests = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "remaining": self.remaining,
+                "reset_at": self.reset_at,
+                "requests": self.requests,
+            }
@@ -0,0 +1,126 @@
+import re
+from dataclasses import dataclass
+
+SNIFF_BYTES = 4096
+
+SIGNAL_KEYS = frozenset(
+    {
+        "sbom_generated", "sbom", "sbom_created",
+        "cosign_signed", "signed",
+        "cosign_verified", "verified", "signature_verified",
+        "image_digest", "digest", "container_digest",
+        "image_tag", "tag", "release_tag",
+    }
+)
+_SIGNAL_KEY_ALTERNATIVES = b"|".join(re.escape(key.encode()) for key in sorted(SIGNAL_KEYS))
+_SIGNAL_KEY_RE = re.compile(
+    rb'"(?:' + _SIGNAL_KEY_ALTERNATIVES + rb'|[^"\\]*https[^"\\]*)"\s*:',
+    re.IGNORECASE,
+)
+
+
+@dataclass(frozen=True)
+class ReportParser:
+    name: str
+    # Summary key the member's findings are counted under. Empty for SARIF, whose tool comes
+    # from the driver name, and for parsers that only contribute supply-chain data.
+    tool: str = ""
+    sarif: bool = False
+    suffixes: tuple[str, ...] = ()
+    name_hints: tuple[str, ...] = ()
+    # Claims a member when every marker of any group appears in its first SNIFF_BYTES.
+    markers: tuple[tuple[bytes, ...], ...] = ()
+    patterns: tuple[re.Pattern[bytes], ...] = ()
+
+    def matches_name(self, lowered_name: str) -> bool:
+        return lowered_name.endswith(self.suffixes) or any(hint in lowered_name for hint in self.name_hints)
+
+    def sniff(self, head: bytes) -> bool:
+        if any(all(marker in head for marker in group) for group in self.markers):
+            return True
+        return any(pattern.search(head) for pattern in self.patterns)
+
+
+SARIF_PARSER = ReportParser(
+    name="sarif",
+    sarif=True,
+    suffixes=(".sarif",),
+    markers=((b'"runs"', b"sarif"), (b'"runs"', b'"driver"')),
+)
+
+# Name hints are checked in registration order, so more specific tools come first.
+REPORT_PARSERS: list[ReportParser] = [
+    SARIF_PARSER,
+    ReportParser(
+        name="zap",
+        tool="zap",
+        name_hints=("zap",),
+        markers=((b'"@programName"',), (b'"site"', b'"alerts"', b'"riskdesc"')),
+    ),
+    ReportParser(
+        name="pip-audit",
+        tool="pip_audit",
+        name_hints=("pip-audit", "pip_audit", "pipaudit"),
+        markers=((b'"dependencies"', b'"vulns"'),),
+    ),
+    ReportParser(name="semgrep", tool="semgrep", name_hints=("semgrep",), markers=((b'"check_id"',),)),
+    ReportParser(
+        name="bandit",
+        tool="bandit",
+        name_hints=("bandit",),
+        markers=((b'"issue_severity"',), (b'"generated_at"', b'"metrics"', b'"results"')),
+    ),
+    ReportParser(
+        name="trivy",
+        tool="trivy",
+        name_hints=("trivy",),
+        markers=((b'"SchemaVersion"', b'"Results"'), (b'"ArtifactName"', b'"Results"')),
+    ),
+    ReportParser(
+        name="gitleaks",
+        tool="gitleaks",
+        name_hints=("gitleaks",),
+        markers=((b'"RuleID"', b'"Secret"'),),
+    ),
+    ReportParser(
+        name="sbom",
+        name_hints=("sbom", "cyclonedx", "spdx"),
+        markers=((b'"bomFormat"',), (b'"spdxVersion"',)),
+    ),
+    ReportParser(name="supply-chain", patterns=(_SIGNAL_KEY_RE,)),
+]
+
+
+def register_report_parser(parser: ReportParser) -> None:
+    REPORT_PARSERS.append(parser)
+
+
+def tool_for_name(name: str) -> str:
+    lowered = name.lower()
+    for parser in REPORT_PARSERS:
+        if parser.tool and any(hint in lowered for hint in parser.name_hints):
+            return parser.tool
+    return ""
+
+
+def select_report_parser(member: str, artifact_name: str, head: bytes) -> ReportParser | None:
+    # SARIF is a container format for many tools, so it is recognised before any tool; then
+    # tools by member name, artifact name and content; parsers without a tool come last.
+    lowered_member = member.lower()
+    for parser in REPORT_PARSERS:
+        if parser.sarif and (parser.matches_name(lowered_member) or parser.sniff(head)):
+            return parser
+    tools = [parser for parser in REPORT_PARSERS if parser.tool and not parser.sarif]
+    for lowered_name in (lowered_member, artifact_name.lower()):
+        for parser in tools:
+            if parser.matches_name(lowered_name):
+                return parser
+    for parser in tools:
+        if parser.sniff(head):
+            return parser
+    for parser in REPORT_PARSERS:
+        if parser.tool or parser.sarif:
+            continue
+        if parser.matches_name(lowered_member) or parser.sniff(head):
+            return parser
+    return None
@@ -0,0 +1,241 @@
+import logging
+import os
+import socket
+import threading
+from collections import OrderedDict, deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+from uuid import uuid4
+
+from .github_service import GithubServiceError
+from .pipeline_service import PipelineService
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+SUMMARIZE_MODE = "summarize"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+@dataclass
+class SyncJob:
+    mode: str
+    per_page: int
+    trigger: str
+    id: str = field(default_factory=lambda: uuid4().hex)
+    status: str = JOB_QUEUED
+    created_at: str = field(default_factory=_now)
+    started_at: str = ""
+    finished_at: str = ""
+    progress: dict[str, Any] = field(default_factory=dict)
+    result: dict[str, Any] | None = None
+    error: str = ""
+    error_detail: str = ""
+    run_ids: list[int] = field(default_factory=list)
+    done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def active(self) -> bool:
+        return self.status in {JOB_QUEUED, JOB_RUNNING}
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self.done.wait(timeout)
+
+
+class SyncJobRunner:
+    def __init__(
+        self,
+        service_provider: Callable[[], PipelineService],
+        max_history: int = 50,
+        lease_poll_seconds: float = 0.5,
+    ):
+        self.service_provider = service_provider
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self.lease_poll_seconds = lease_poll_seconds
+        self._stop_event = threading.Event()
+        self.max_history = max(1, max_history)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._queue: deque[SyncJob] = deque()
+        self._jobs: OrderedDict[str, SyncJob] = OrderedDict()
+        self._current: SyncJob | None = None
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+
+    def submit(
+        self,
+        per_page: int = 30,
+        mode: str = "incremental",
+        trigger: str = "manual",
+    ) -> tuple[SyncJob, bool]:
+        with self._lock:
+            # Triggers that arrive while an equivalent sync (same mode and page size) is queued or
+            # running share that job.
+            for job in (self._current, *self._queue):
+                if job is not None and job.active and (job.mode, job.per_page) == (mode, per_page):
+                    return job, False
+            job = SyncJob(mode=mode, per_page=per_page, trigger=trigger)
+            self._enqueue(job)
+            return job, True
+
+    def _enqueue(self, job: SyncJob) -> None:
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.max_history:
+            oldest_id, oldest = next(iter(self._jobs.items()))
+            if oldest.active:
+                break
+            del self._jobs[oldest_id]
+        self._queue.append(job)
+        self._ensure_worker()
+        self._wakeup.notify()
+
+    def submit_summaries(self, run_ids: list[int], trigger: str = "webhook") -> tuple[SyncJob, bool]:
+        with self._lock:
+            # Webhook deliveries that arrive before the queued summarize job starts are folded into it.
+            for job in self._queue:
+                if job.mode == SUMMARIZE_MODE:
+                    job.run_ids.extend(run_id for run_id in run_ids if run_id not in job.run_ids)
+                    return job, False
+            job = SyncJob(
+                mode=SUMMARIZE_MODE,
+                per_page=0,
+                trigger=trigger,
+                run_ids=list(dict.fromkeys(run_ids)),
+            )
+            self._enqueue(job)
+            return job, True
+
+    def get(self, job_id: str) -> SyncJob | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _ensure_worker(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._work, name="sync-jobs", daemon=True)
+        self._thread.start()
+
+    def _work(self) -> None:
+        while True:
+            with self._lock:
+                while not self._queue and not self._stopping:
+                    self._wakeup.wait()
+                if self._stopping:
+                    return
+                job = self._queue.popleft()
+                self._current = job
+                job.status = JOB_RUNNING
+                job.started_at = _now()
+            self._run(job)
+            with self._lock:
+                self._current = None
+
+    def _run(self, job: SyncJob) -> None:
+        def _progress(update: dict[str, Any]) -> None:
+            job.progress = dict(update)
+
+        try:
+            service = self.service_provider()
+            if job.mode == SUMMARIZE_MODE:
+                job.result = service.summarize_runs(job.run_ids)
+            elif service.sync_lease is None:
+                job.result = service.sync(per_page=job.per_page, mode=job.mode, progress=_progress)
+            else:
+                job.result = self._run_single_flight(service, job, _progress)
+            job.status = JOB_SUCCEEDED
+        except GithubServiceError as exc:
+            job.status = JOB_FAILED
+            job.error = str(exc)
+            job.error_detail = f"{type(exc).__name__}: {exc}"
+            logger.warning("Sync job %s failed (GitHub): %s", job.id, exc)
+        except Exception as exc:
+            job.status = JOB_FAILED
+            job.error = "Internal sync error"
+            job.error_detail = f"{type(exc).__name__}: {exc}"
+            logger.exception("Sync job %s failed unexpectedly", job.id)
+        finally:
+            job.finished_at = _now()
+            job.done.set()
+
+    def _run_single_flight(
+        self,
+        service: PipelineService,
+        job: SyncJob,
+        progress: Callable[[dict[str, Any]], None],
+    ) -> dict[str, Any]:
+        # The lease row in SQLite spans processes: whoever holds it runs the sync, everyone else
+        # waits for it to finish and reuses its result when the modes match.
+        lease = service.sync_lease
+        while True:
+            if lease.try_acquire(self.owner, job.mode):
+                return self._run_as_leader(service, job, progress)
+            state = lease.state()
+            job.progress = {"waiting_for": state["owner"], "leader_mode": state["mode"]}
+            generation = state["generation"]
+            while not self._stop_event.wait(self.lease_poll_seconds):
+                state = lease.state()
+                if state["generation"] != generation:
+                    result = state["result"]
+                    if (
+                        state["result_mode"] == job.mode
+                        and result is not None
+                        and result.get("per_page") == job.per_page
+                    ):
+                        return {**result, "shared": True}
+                    break
+                if state["owner"] == "" or state["expires_at"] < lease.clock():
+                    break
+            else:
+                raise RuntimeError("Sync runner stopped while waiting for the sync lease")
+
+    def _run_as_leader(
+        self,
+        service: PipelineService,
+        job: SyncJob,
+        progress: Callable[[dict[str, Any]], None],
+    ) -> dict[str, Any]:
+        lease = service.sync_lease
+        stop_heartbeat = threading.Event()
+
+        def _heartbeat() -> None:
+            while not stop_heartbeat.wait(lease.ttl_seconds / 3):
+                if not lease.renew(self.owner):
+                    logger.warning("Sync lease was lost while job %s was running", job.id)
+                    return
+
+        heartbeat = threading.Thread(target=_heartbeat, name="sync-lease-heartbeat", daemon=True)
+        heartbeat.start()
+        result = None
+        try:
+            result = service.sync(per_page=job.per_page, mode=job.mode, progress=progress)
+            return result
+        finally:
+            stop_heartbeat.set()
+            heartbeat.join()
+            lease.release(self.owner, result)
+
+    def shutdown(self, timeout: float | None = 5) -> None:
+        self._stop_event.set()
+        with self._lock:
+            self._stopping = True
+            thread = self._thread
+            abandoned = list(self._queue)
+            self._queue.clear()
+            self._wakeup.notify_all()
+        for job in abandoned:
+            job.status = JOB_FAILED
+            job.error = "Sync runner stopped before the job started"
+            job.finished_at = _now()
+            job.done.set()
+        if thread is not None:
+            thread.join(timeout)
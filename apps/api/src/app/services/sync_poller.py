@@ -1,8 +1,80 @@
+import multiprocessing
 import os
+import random
 import threading
+import time
+from datetime import datetime, timezone
 from typing import Any
 
-from .github_service import GithubServiceError
+from .sync_jobs import JOB_FAILED
+
+
+def _iso(timestamp: float | None) -> str:
+    if timestamp is None:
+        return ""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+
+
+class AdaptivePollSchedule:
+    def __init__(
+        self,
+        base_interval: float,
+        fast_interval: float,
+        max_interval: float,
+        idle_cycles_before_backoff: int = 3,
+        jitter_ratio: float = 0.1,
+        follow_active_runs: bool = True,
+        rng: random.Random | None = None,
+        clock=time.time,
+    ):
+        self.base_interval = float(base_interval)
+        self.fast_interval = min(float(fast_interval), self.base_interval)
+        self.max_interval = max(float(max_interval), self.base_interval)
+        self.idle_cycles_before_backoff = max(1, idle_cycles_before_backoff)
+        self.jitter_ratio = max(0.0, jitter_ratio)
+        self.follow_active_runs = follow_active_runs
+        self.rng = rng or random.Random()
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.idle_cycles = 0
+        self.active_runs = 0
+        self.interval = self.base_interval
+        self.last_run_at: float | None = None
+        self.next_run_at: float | None = None
+
+    def _target_interval(self) -> float:
+        if self.follow_active_runs and self.active_runs > 0:
+            return self.fast_interval
+        extra_idle = self.idle_cycles - self.idle_cycles_before_backoff + 1
+        if extra_idle <= 0:
+            return self.base_interval
+        return min(self.max_interval, self.base_interval * 2 ** min(extra_idle, 32))
+
+    def record(self, result: dict[str, Any] | None) -> float:
+        changed = bool(result) and (result.get("inserted", 0) or result.get("updated", 0))
+        with self._lock:
+            if result is not None:
+                self.active_runs = int(result.get("active_runs", 0) or 0)
+            self.idle_cycles = 0 if changed else self.idle_cycles + 1
+            self.interval = self._target_interval()
+            # Jitter keeps replicas that started together from polling in lockstep.
+            delay = self.interval * (1 + self.rng.uniform(-self.jitter_ratio, self.jitter_ratio))
+            self.last_run_at = self.clock()
+            self.next_run_at = self.last_run_at + delay
+            return delay
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "interval_seconds": self.interval,
+                "base_interval_seconds": self.base_interval,
+                "fast_interval_seconds": self.fast_interval,
+                "max_interval_seconds": self.max_interval,
+                "idle_cycles": self.idle_cycles,
+                "active_runs": self.active_runs,
+                "last_run_at": _iso(self.last_run_at),
+                "next_run_at": _iso(self.next_run_at),
+            }
 
 
 def _sync_once(app) -> dict[str, Any] | None:
@@ -13,18 +85,40 @@ def _sync_once(app) -> dict[str, Any] | None:
         return None
 
     per_page = int(app.config.get("POLLING_PER_PAGE", 30))
-    factory = app.extensions.get("pipeline_service_factory")
-    if not callable(factory):
-        app.logger.warning("Polling skipped: pipeline_service_factory is not configured")
+    container = app.extensions.get("service_container")
+    if container is None:
+        app.logger.warning("Polling skipped: service_container is not configured")
+        return None
+    job, _ = container.sync_jobs.submit(per_page=per_page, trigger="poller")
+    job.wait()
+    if job.status == JOB_FAILED:
+        app.logger.warning("Polling sync failed: %s", job.error)
         return None
-    service = factory()
-    result = service.sync(per_page=per_page)
-    return result
+    return job.result
+
+
+def build_poll_schedule(config) -> AdaptivePollSchedule:
+    base_interval = int(config.get("POLLING_INTERVAL_SECONDS", 300))
+    webhook_enabled = bool(config.get("GITHUB_WEBHOOK_SECRET"))
+    if webhook_enabled:
+        # Webhooks deliver run updates; polling only reconciles missed deliveries.
+        base_interval = max(base_interval, int(config.get("POLLING_RECONCILE_INTERVAL_SECONDS", 1800)))
+    return AdaptivePollSchedule(
+        base_interval=base_interval,
+        fast_interval=int(config.get("POLLING_FAST_INTERVAL_SECONDS", 30)),
+        max_interval=int(config.get("POLLING_MAX_INTERVAL_SECONDS", 3600)),
+        idle_cycles_before_backoff=int(config.get("POLLING_IDLE_CYCLES_BEFORE_BACKOFF", 3)),
+        jitter_ratio=float(config.get("POLLING_JITTER_RATIO", 0.1)),
+        follow_active_runs=not webhook_enabled,
+    )
 
 
 def start_sync_poller(app) -> None:
     if app.config.get("TESTING"):
         return
+    # Artifact parse workers are spawned children; they must never poll on their own.
+    if multiprocessing.parent_process() is not None:
+        return
     # Avoid duplicate poller thread in Werkzeug reloader parent process.
     if app.debug and os.getenv("WERKZEUG_RUN_MAIN") != "true":
         return
@@ -33,24 +127,34 @@ def start_sync_poller(app) -> None:
     if "sync_poller_thread" in app.extensions:
         return
 
-    interval = int(app.config.get("POLLING_INTERVAL_SECONDS", 300))
+    schedule = build_poll_schedule(app.config)
     stop_event = threading.Event()
 
     def _runner():
         while not stop_event.is_set():
+            result = None
             try:
                 with app.app_context():
                     result = _sync_once(app)
-                    if result is not None:
-                        app.logger.info("Polling sync completed: %s runs", result.get("synced", 0))
-            except GithubServiceError as exc:
-                app.logger.warning("Polling sync failed (GitHub): %s", exc)
+                    if result is not None and result.get("not_modified"):
+                        app.logger.info("Polling sync skipped: workflow runs not modified")
+                    elif result is not None:
+                        app.logger.info(
+                            "Polling sync completed: %s runs over %s pages "
+                            "(%s inserted, %s updated, %s unchanged)",
+                            result.get("synced", 0),
+                            result.get("pages", 0),
+                            result.get("inserted", 0),
+                            result.get("updated", 0),
+                            result.get("unchanged", 0),
+                        )
             except Exception:
                 app.logger.exception("Polling sync failed unexpectedly")
-            stop_event.wait(interval)
+            stop_event.wait(schedule.record(result))
 
     thread = threading.Thread(target=_runner, name="sync-poller", daemon=True)
     thread.start()
 
     app.extensions["sync_poller_thread"] = thread
     app.extensions["sync_poller_stop_event"] = stop_event
+    app.extensions["sync_poller_schedule"] = schedule
@@ -2,9 +2,10 @@ import os
 
 from app import create_app
 
-app = create_app()
-
+# Process-pool workers re-import this module as __mp_main__, so the app is only built when run
+# directly. WSGI servers import wsgi:app instead.
 if __name__ == "__main__":
+    app = create_app()
     host = os.getenv("APP_HOST", "127.0.0.1")
     port = int(os.getenv("APP_PORT", "5000"))
     app.run(host=host, port=port)
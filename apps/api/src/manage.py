@@ -0,0 +1,62 @@
+import argparse
+import json
+import sys
+from contextlib import nullcontext
+
+from app import create_app
+
+
+def _repository(app):
+    return app.extensions["service_container"].pipeline_service.repository
+
+
+def _migrate(app, args) -> int:
+    repository = _repository(app)
+    print(f"Schema version: {repository.schema_version()} ({repository.storage_path})")
+    return 0
+
+
+def _export(app, args) -> int:
+    service = app.extensions["service_container"].pipeline_service
+    target = nullcontext(sys.stdout) if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    with target as handle:
+        handle.writelines(service.export_runs())
+    return 0
+
+
+def _import(app, args) -> int:
+    service = app.extensions["service_container"].pipeline_service
+    source = nullcontext(sys.stdin) if args.input == "-" else open(args.input, encoding="utf-8")
+    with source as handle:
+        result = service.import_runs(handle)
+    print(json.dumps(result))
+    return 0
+
+
+COMMANDS = {
+    "migrate": _migrate,
+    "export": _export,
+    "import": _import,
+}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="DevSecOps dashboard API maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("migrate", help="Apply pending run store migrations and exit")
+    export_parser = subparsers.add_parser("export", help="Write every stored run as NDJSON")
+    export_parser.add_argument("--output", "-o", default="-", help="Output file (default: stdout)")
+    import_parser = subparsers.add_parser("import", help="Upsert runs from an NDJSON file")
+    import_parser.add_argument("input", nargs="?", default="-", help="Input file (default: stdin)")
+    args = parser.parse_args(argv)
+
+    # Building the app runs container startup, which applies pending migrations.
+    app = create_app({"POLLING_ENABLED": False})
+    try:
+        return COMMANDS[args.command](app, args)
+    finally:
+        app.extensions["service_container"].shutdown()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
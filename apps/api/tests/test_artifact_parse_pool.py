@@ -0,0 +1,117 @@
+import importlib
+import io
+import json
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+from flask import Flask
+
+from app.services.artifact_parse_pool import ArtifactParsePool, PendingArchive
+from app.services.artifact_summary import ArchiveLimits, ArtifactSummaryBuilder
+from app.services.sync_poller import start_sync_poller
+
+
+def _archive(members: dict[str, dict]) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, payload in members.items():
+            zf.writestr(name, json.dumps(payload))
+    return buffer.getvalue()
+
+
+ARCHIVES = [
+    ("trivy-scan", _archive({"trivy.json": {"Results": [{"Vulnerabilities": [{"Severity": "HIGH"}] * 3}]}})),
+    ("release", _archive({"release.json": {"https_enforced": False, "image_tag": "v1"}})),
+    ("bandit-scan", _archive({"bandit.json": {"results": [{"issue_severity": "LOW"}]}, "cosign.sig.txt": {}})),
+    ("release-final", _archive({"release.json": {"https_enforced": True, "image_tag": "v2"}})),
+]
+
+
+def _summarize(pool: ArtifactParsePool) -> dict:
+    limits = ArchiveLimits()
+    builder = ArtifactSummaryBuilder(limits)
+    pending = [pool.submit(name, io.BytesIO(data), limits) for name, data in ARCHIVES]
+    for item in pending:
+        builder.add_analysis(item.result())
+    return builder.summary()
+
+
+def test_process_pool_results_match_inline_parsing_in_artifact_order():
+    inline = _summarize(ArtifactParsePool(workers=0))
+    pool = ArtifactParsePool(workers=2, min_archive_bytes=0)
+    try:
+        pooled = _summarize(pool)
+    finally:
+        pool.close()
+
+    assert pooled == inline
+    assert pooled["tools"]["trivy"]["high"] == 3
+    assert pooled["tools"]["bandit"]["low"] == 1
+    assert pooled["supply_chain"]["https_ok"] is True
+    assert pooled["supply_chain"]["image_tag"] == "v2"
+    assert pooled["supply_chain"]["cosign_signed"] is True
+
+
+def test_small_archives_stay_inline_and_broken_workers_fall_back(tmp_path):
+    pool = ArtifactParsePool(workers=2, min_archive_bytes=1024 * 1024)
+    pending = pool.submit("trivy-scan", io.BytesIO(ARCHIVES[0][1]), ArchiveLimits())
+    assert pending.future.done()
+    assert pool._executor is None
+
+    spooled = tmp_path / "trivy-scan.zip"
+    spooled.write_bytes(ARCHIVES[0][1])
+    broken: Future = Future()
+    broken.set_exception(BrokenProcessPool("worker died"))
+    discarded = []
+    fallback = PendingArchive("trivy-scan", ArchiveLimits(), broken, str(spooled), lambda: discarded.append(True))
+
+    assert fallback.result().members[0].severities == {"high": 3}
+    assert discarded == [True]
+    assert not spooled.exists()
+
+
+def test_pooled_archives_are_handed_over_as_temp_files(monkeypatch, tmp_path):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    submitted = []
+
+    class _RecordingExecutor:
+        def submit(self, fn, *args):
+            submitted.append(args)
+            future: Future = Future()
+            future.set_result(fn(*args))
+            return future
+
+    pool = ArtifactParsePool(workers=2, min_archive_bytes=0)
+    pool._executor = _RecordingExecutor()
+    pending = pool.submit("trivy-scan", io.BytesIO(ARCHIVES[0][1]), ArchiveLimits())
+
+    [(artifact_name, path, _)] = submitted
+    assert artifact_name == "trivy-scan"
+    assert isinstance(path, str) and open(path, "rb").read() == ARCHIVES[0][1]
+    assert pending.result().members[0].severities == {"high": 3}
+    assert list(tmp_path.iterdir()) == []
+
+
+def _worker_poller_state() -> dict:
+    main = importlib.import_module("main")
+    app = Flask("worker-probe")
+    app.config.update(TESTING=False, POLLING_ENABLED=True)
+    start_sync_poller(app)
+    return {
+        "main_built_app": hasattr(main, "app"),
+        "poller_started": "sync_poller_thread" in app.extensions,
+        "threads": [thread.name for thread in threading.enumerate()],
+    }
+
+
+def test_parse_workers_do_not_build_the_app_or_start_the_poller():
+    pool = ArtifactParsePool(workers=1, min_archive_bytes=0)
+    try:
+        state = pool._pool().submit(_worker_poller_state).result(timeout=60)
+    finally:
+        pool.close()
+
+    assert state == {"main_built_app": False, "poller_started": False, "threads": ["MainThread"]}
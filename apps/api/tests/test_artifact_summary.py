@@ -2,7 +2,9 @@ import io
 import json
 import zipfile
 
-from app.services.artifact_summary import summarize_artifact_archives
+from app.services import artifact_summary, report_parsers
+from app.services.artifact_summary import ArchiveLimits, ArtifactSummaryBuilder, summarize_artifact_archives
+from app.services.report_parsers import ReportParser, register_report_parser
 
 
 def _zip_with_json(name: str, payload: dict) -> bytes:
@@ -68,3 +70,123 @@ def test_summarize_zap_json_by_artifact_name():
     assert summary["tools"]["zap"]["high"] == 1
     assert summary["tools"]["zap"]["medium"] == 1
     assert summary["tools"]["zap"]["low"] == 1
+
+
+def test_oversized_and_highly_compressed_members_are_skipped():
+    def _trivy(severity, count=1):
+        return json.dumps({"Results": [{"Vulnerabilities": [{"Severity": severity}] * count}]})
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("trivy-big.json", _trivy("LOW", 20))
+        # Two MiB of padding compresses to a few KB, well past a 50x ratio.
+        zf.writestr("trivy-bomb.json", _trivy("MEDIUM")[:-1] + " " * 2**21 + "}")
+        zf.writestr("trivy-small.json", _trivy("HIGH"))
+    archives = [("trivy-scan", buffer.getvalue())]
+
+    capped = summarize_artifact_archives(archives, limits=ArchiveLimits(max_member_bytes=300))
+    assert capped["tools"]["trivy"] == {"critical": 0, "high": 1, "medium": 0, "low": 0, "unknown": 0}
+
+    ratio_guarded = summarize_artifact_archives(archives, limits=ArchiveLimits(max_compression_ratio=50))
+    assert ratio_guarded["tools"]["trivy"] == {"critical": 0, "high": 1, "medium": 0, "low": 20, "unknown": 0}
+
+    unguarded = summarize_artifact_archives(archives, limits=ArchiveLimits(max_compression_ratio=10**6))
+    assert unguarded["tools"]["trivy"]["medium"] == 1
+
+
+def test_streaming_parse_matches_in_memory_parse():
+    sarif = {
+        "runs": [
+            {
+                "tool": {"driver": {"name": "Bandit"}},
+                "results": [{"level": "error"}, {"level": "note"}] * 500,
+            },
+            {"tool": {"driver": {"name": "Semgrep"}}, "results": [{"level": "warning"}]},
+        ]
+    }
+    sbom = {
+        "bomFormat": "CycloneDX",
+        "metadata": {"component": {"digest": "sha256:abc", "tag": " v1.2.0 "}},
+        "components": [{"name": f"pkg-{index}", "signed": "yes"} for index in range(200)],
+    }
+    trivy = {
+        "Results": [{"Vulnerabilities": [{"Severity": "HIGH"}, {"Severity": "LOW"}]}],
+        "dependencies": [{"vulns": [{"severity": "critical"}]}],
+    }
+    archives = [
+        ("bandit-scan", _zip_with_json("bandit.sarif", sarif)),
+        ("sbom", _zip_with_json("bom.json", sbom)),
+        ("trivy-scan", _zip_with_json("trivy-report.json", trivy)),
+        ("broken", _zip_with_json("trivy-broken.json", trivy)[:-1]),
+    ]
+    truncated = io.BytesIO()
+    with zipfile.ZipFile(truncated, "w") as zf:
+        zf.writestr("trivy-cut.json", json.dumps(trivy)[:-2])
+    archives.append(("trivy-scan", truncated.getvalue()))
+
+    in_memory = summarize_artifact_archives(archives)
+    streamed = summarize_artifact_archives(archives, limits=ArchiveLimits(stream_member_bytes=0))
+
+    assert streamed == in_memory
+    assert streamed["tools"]["bandit"] == {"critical": 0, "high": 500, "medium": 1, "low": 500, "unknown": 0}
+    assert streamed["tools"]["trivy"] == {"critical": 1, "high": 1, "medium": 0, "low": 1, "unknown": 0}
+    assert streamed["supply_chain"]["sbom_generated"] is True
+    assert streamed["supply_chain"]["cosign_signed"] is True
+    assert streamed["supply_chain"]["image_digest"] == "sha256:abc"
+    assert streamed["supply_chain"]["image_tag"] == "v1.2.0"
+
+
+def test_streaming_parse_respects_member_ceiling():
+    payload = {"Results": [{"Vulnerabilities": [{"Severity": "HIGH"}] * 50}]}
+    archives = [("trivy-scan", _zip_with_json("trivy-report.json", payload))]
+
+    summary = summarize_artifact_archives(
+        archives,
+        limits=ArchiveLimits(stream_member_bytes=0, max_member_bytes=10**6),
+    )
+    assert summary["tools"]["trivy"]["high"] == 50
+
+    builder = ArtifactSummaryBuilder(ArchiveLimits(stream_member_bytes=0, max_member_bytes=100))
+    builder.add_archive("trivy-scan", io.BytesIO(archives[0][1]))
+    assert builder.summary() == {"skipped": ["trivy-scan/trivy-report.json"]}
+
+
+def test_members_are_routed_by_sniffed_content_and_unclaimed_ones_skipped(monkeypatch):
+    decoded = []
+    real_loads = json.loads
+    monkeypatch.setattr(artifact_summary.json, "loads", lambda text: decoded.append(text) or real_loads(text))
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr(
+            "scan.json",
+            json.dumps({"SchemaVersion": 2, "Results": [{"Vulnerabilities": [{"Severity": "HIGH"}]}]}),
+        )
+        zf.writestr("coverage.json", json.dumps({"files": {"app.py": {"severity": "HIGH"}}}))
+        zf.writestr("bom.json", json.dumps({"bomFormat": "CycloneDX", "components": []}))
+        zf.writestr("release.json", json.dumps({"image_tag": "v2", "image_digest": "sha256:def"}))
+
+    summary = summarize_artifact_archives([("reports", buffer.getvalue())])
+
+    assert summary["tools"] == {"trivy": {"critical": 0, "high": 1, "medium": 0, "low": 0, "unknown": 0}}
+    assert summary["supply_chain"]["sbom_generated"] is True
+    assert summary["supply_chain"]["image_tag"] == "v2"
+    assert len(decoded) == 3
+    assert not any("coverage" in text or "app.py" in text for text in decoded)
+
+
+def test_registered_parser_claims_new_tool(monkeypatch):
+    monkeypatch.setattr(report_parsers, "REPORT_PARSERS", list(report_parsers.REPORT_PARSERS))
+    register_report_parser(
+        ReportParser(
+            name="osv-scanner",
+            tool="osv",
+            name_hints=("osv",),
+            markers=((b'"packages"', b'"vulnerabilities"'),),
+        )
+    )
+    payload = {"results": [{"packages": [], "vulnerabilities": [{"severity": "moderate"}, {"severity": "high"}]}]}
+
+    summary = summarize_artifact_archives([("scan", _zip_with_json("scan-results.json", payload))])
+
+    assert summary["tools"]["osv"] == {"critical": 0, "high": 1, "medium": 0, "low": 0, "unknown": 1}
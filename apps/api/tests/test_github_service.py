@@ -0,0 +1,321 @@
+import io
+import json
+import threading
+import time
+import zipfile
+from email.message import Message
+
+from app.services.github_service import GithubService, GithubServiceError
+from app.services.artifact_parse_pool import ArtifactParsePool
+from app.services.artifact_summary import ArchiveLimits
+from app.services.http_pool import HttpConnectionPool, HttpResponse, ResponseTooLarge
+
+
+def test_build_run_summaries_runs_in_parallel_and_keeps_order(monkeypatch):
+    service = GithubService("https://api.github.test", "example", "repo", max_workers=4)
+    release_slow = threading.Event()
+    finished = []
+
+    def _fake_summary(self, run_id):
+        if run_id == 1:
+            release_slow.wait(5)
+        if run_id == 3:
+            raise GithubServiceError("boom")
+        finished.append(run_id)
+        if len(finished) == 2:
+            release_slow.set()
+        return {"tools": {"trivy": {"high": run_id}}}
+
+    monkeypatch.setattr(GithubService, "build_run_summary", _fake_summary)
+    started = time.monotonic()
+    summaries = service.build_run_summaries([1, 2, 3, 4, 2])
+
+    assert time.monotonic() - started < 5
+    assert finished[-1] == 1
+    assert list(summaries) == [1, 2, 3, 4]
+    assert summaries[3] == {"status": "pending"}
+    assert summaries[4]["tools"]["trivy"]["high"] == 4
+
+
+class _MemoryCache:
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, run_id, fingerprint):
+        return self.entries.get((run_id, fingerprint))
+
+    def put(self, run_id, fingerprint, summary):
+        self.entries[(run_id, fingerprint)] = summary
+
+
+def test_build_run_summary_reuses_cache_until_artifacts_change(monkeypatch):
+    cache = _MemoryCache()
+    service = GithubService("https://api.github.test", "example", "repo", summary_cache=cache)
+    artifacts = [{"id": 7, "name": "trivy-scan", "size_in_bytes": 10, "updated_at": "2026-02-15T10:00:00Z"}]
+    downloads = []
+
+    monkeypatch.setattr(GithubService, "list_run_artifacts", lambda self, run_id: artifacts)
+    monkeypatch.setattr(
+        GithubService,
+        "download_artifact_zip",
+        lambda self, artifact_id: downloads.append(artifact_id) or io.BytesIO(b""),
+    )
+
+    service.build_run_summary(run_id=1)
+    service.build_run_summary(run_id=1)
+    assert downloads == [7]
+
+    artifacts[0] = {**artifacts[0], "size_in_bytes": 11}
+    service.build_run_summary(run_id=1)
+    assert downloads == [7, 7]
+
+
+def test_failed_artifact_download_keeps_summary_pending_until_retried(monkeypatch):
+    cache = _MemoryCache()
+    service = GithubService("https://api.github.test", "example", "repo", summary_cache=cache)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("trivy.json", json.dumps({"Results": [{"Vulnerabilities": [{"Severity": "HIGH"}]}]}))
+    attempts = []
+
+    def _flaky_download(self, artifact_id):
+        attempts.append(artifact_id)
+        if len(attempts) == 1:
+            raise GithubServiceError("timeout")
+        return io.BytesIO(buffer.getvalue())
+
+    monkeypatch.setattr(GithubService, "list_run_artifacts", lambda self, run_id: [{"id": 7, "name": "trivy"}])
+    monkeypatch.setattr(GithubService, "download_artifact_zip", _flaky_download)
+
+    assert service.build_run_summary(run_id=1) == {"status": "pending"}
+    assert cache.entries == {}
+
+    summary = service.build_run_summary(run_id=1)
+    assert summary["tools"]["trivy"]["high"] == 1
+    assert list(cache.entries.values()) == [summary]
+
+
+class _FakePool:
+    def __init__(self, handler):
+        self.handler = handler
+        self.calls = []
+
+    def request(self, method, url, headers=None, sink=None, max_bytes=None):
+        self.calls.append((url, dict(headers or {})))
+        status, response_headers, body = self.handler(url, headers or {})
+        message = Message()
+        for name, value in response_headers.items():
+            message[name] = value
+        if sink is not None and status == 200:
+            if max_bytes is not None and len(body) > max_bytes:
+                raise ResponseTooLarge("too large")
+            sink.write(body)
+            body = b""
+        return HttpResponse(status=status, headers=message, body=body)
+
+    def close(self):
+        pass
+
+
+class _MemoryValidators:
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, url):
+        return self.entries.get(url)
+
+    def put(self, url, etag, last_modified, body):
+        self.entries[url] = {"etag": etag, "last_modified": last_modified, "body": body}
+
+
+def test_conditional_requests_reuse_validators_on_304():
+    from app.services.github_service import GithubNotModified
+
+    def _handler(url, headers):
+        if headers.get("If-None-Match") == '"v1"':
+            return 304, {}, b""
+        body = b'{"workflow_runs": [{"id": 1}], "artifacts": [{"id": 9, "name": "a"}]}'
+        return 200, {"ETag": '"v1"'}, body
+
+    pool = _FakePool(_handler)
+    validators = _MemoryValidators()
+    service = GithubService(
+        "https://api.github.test", "example", "repo", validator_cache=validators, http_pool=pool
+    )
+
+    assert service.list_workflow_runs(per_page=5) == [{"id": 1}]
+    try:
+        service.list_workflow_runs(per_page=5)
+        raise AssertionError("expected GithubNotModified")
+    except GithubNotModified:
+        pass
+    assert service.list_run_artifacts(7) == [{"id": 9, "name": "a"}]
+    assert service.list_run_artifacts(7) == [{"id": 9, "name": "a"}]
+    assert [headers.get("If-None-Match") for _, headers in pool.calls] == [None, '"v1"', None, '"v1"']
+
+
+def test_artifact_redirect_drops_token_for_other_hosts():
+    def _handler(url, headers):
+        if url.startswith("https://api.github.test/"):
+            return 302, {"Location": "https://blob.example.test/zip?sig=abc"}, b""
+        return 200, {}, b"zip-bytes"
+
+    pool = _FakePool(_handler)
+    service = GithubService("https://api.github.test", "example", "repo", token="secret", http_pool=pool)
+
+    with service.download_artifact_zip(5) as archive:
+        assert archive.read() == b"zip-bytes"
+    assert pool.calls[0][1]["Authorization"] == "Bearer secret"
+    assert pool.calls[1][0] == "https://blob.example.test/zip?sig=abc"
+    assert "Authorization" not in pool.calls[1][1]
+
+
+def test_connection_pool_reuses_keep_alive_connections():
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    peers = []
+
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            peers.append(self.client_address)
+            body = b'{"ok": true}'
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    pool = HttpConnectionPool(max_per_host=2, timeout=5)
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/runs"
+        responses = [pool.request("GET", url) for _ in range(3)]
+    finally:
+        pool.close()
+        server.shutdown()
+        server.server_close()
+
+    assert [response.status for response in responses] == [200, 200, 200]
+    assert len(set(peers)) == 1
+
+
+def test_secondary_rate_limit_is_retried_after_backoff():
+    attempts = []
+
+    def _handler(url, headers):
+        attempts.append(url)
+        if len(attempts) == 1:
+            return 403, {"Retry-After": "2", "X-RateLimit-Remaining": "4000"}, b"secondary rate limit"
+        return 200, {"X-RateLimit-Remaining": "3999", "X-RateLimit-Reset": str(int(time.time()) + 60)}, b"{}"
+
+    service = GithubService("https://api.github.test", "example", "repo", http_pool=_FakePool(_handler))
+    slept = []
+    service.sleep = slept.append
+
+    assert service.list_run_artifacts(1) == []
+    assert slept == [2.0]
+    assert service.rate_limit.snapshot()["remaining"] == 3999
+    assert service.rate_limit.snapshot()["requests"] == 2
+
+
+def test_exhausted_budget_defers_summaries_as_pending():
+    from app.services.rate_limit import RateLimitBudget
+
+    calls = []
+
+    def _handler(url, headers):
+        calls.append(url)
+        return 200, {}, b'{"artifacts": []}'
+
+    budget = RateLimitBudget(reserve=10)
+    service = GithubService(
+        "https://api.github.test", "example", "repo", http_pool=_FakePool(_handler), rate_limit=budget
+    )
+    budget.update({"X-RateLimit-Remaining": "5", "X-RateLimit-Reset": str(int(time.time()) + 600)})
+
+    assert service.build_run_summary(1) == {"status": "pending"}
+    assert calls == []
+    budget.update({"X-RateLimit-Reset": str(int(time.time()) - 1)})
+    assert service.build_run_summary(1) == {}
+    assert len(calls) == 1
+
+
+def test_any_artifact_failure_leaves_the_summary_pending(monkeypatch):
+    artifacts = json.dumps({"artifacts": [{"id": 1, "name": "trivy-scan"}]}).encode()
+
+    def _listing(url):
+        return 200, {}, artifacts
+
+    def _server_error(url, headers):
+        return _listing(url) if url.endswith("/runs/1/artifacts") else (502, {}, b"bad gateway")
+
+    def _timeout(url, headers):
+        if url.endswith("/runs/1/artifacts"):
+            return _listing(url)
+        raise TimeoutError("timed out")
+
+    def _expired_redirect(url, headers):
+        if url.endswith("/runs/1/artifacts"):
+            return _listing(url)
+        if url.endswith("/artifacts/1/zip"):
+            return 302, {"Location": "https://blob.example.test/artifact.zip?sig=old"}, b""
+        return 403, {}, b"AuthenticationFailed: signature expired"
+
+    def _listing_error(url, headers):
+        return 500, {}, b""
+
+    for handler in (_server_error, _timeout, _expired_redirect, _listing_error):
+        cache = _MemoryCache()
+        service = GithubService(
+            "https://api.github.test", "example", "repo", http_pool=_FakePool(handler), summary_cache=cache
+        )
+        assert service.build_run_summaries([1]) == {1: {"status": "pending"}}, handler.__name__
+        assert cache.entries == {}
+
+    def _spool_failure(self, artifact_name, archive, limits):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(ArtifactParsePool, "submit", _spool_failure)
+    service = GithubService("https://api.github.test", "example", "repo", http_pool=_FakePool(_expired_redirect))
+    monkeypatch.setattr(GithubService, "download_artifact_zip", lambda self, artifact_id: io.BytesIO(b"zip"))
+    assert service.build_run_summaries([1, 2]) == {1: {"status": "pending"}, 2: {"status": "pending"}}
+
+
+def test_artifacts_are_streamed_and_oversized_archives_skipped():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("trivy.json", json.dumps({"Results": [{"Vulnerabilities": [{"Severity": "HIGH"}]}]}))
+    archive = buffer.getvalue()
+
+    def _handler(url, headers):
+        if url.endswith("/runs/1/artifacts"):
+            artifacts = [
+                {"id": 1, "name": "trivy-scan", "size_in_bytes": len(archive)},
+                {"id": 2, "name": "zap-scan", "size_in_bytes": 10**9},
+                {"id": 3, "name": "bandit-scan"},
+            ]
+            return 200, {}, json.dumps({"artifacts": artifacts}).encode()
+        if url.endswith("/artifacts/1/zip"):
+            return 200, {}, archive
+        return 200, {}, b"x" * 5000
+
+    pool = _FakePool(_handler)
+    limits = ArchiveLimits(max_archive_bytes=4096, spool_memory_bytes=0)
+    service = GithubService(
+        "https://api.github.test", "example", "repo", http_pool=pool, archive_limits=limits
+    )
+    cache = _MemoryCache()
+    service.summary_cache = cache
+
+    summary = service.build_run_summary(1)
+    assert summary["tools"]["trivy"]["high"] == 1
+    assert summary["skipped"] == ["zap-scan", "bandit-scan"]
+    assert [url.rsplit("/", 2)[-2] for url, _ in pool.calls[1:]] == ["1", "3"]
+    # Oversized archives are a permanent condition, so the summary is cached with its skip list.
+    assert list(cache.entries.values()) == [summary]
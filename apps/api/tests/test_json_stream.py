@@ -0,0 +1,49 @@
+import io
+import json
+
+import pytest
+
+from app.repositories.json_stream import JSONStreamError, iter_json_events
+
+
+def _rebuild(events):
+    stack = [[]]
+    keys = []
+    for event, value in events:
+        if event == "start_map":
+            stack.append({})
+        elif event == "start_array":
+            stack.append([])
+        elif event == "map_key":
+            keys.append(value)
+            continue
+        else:
+            if event in {"end_map", "end_array"}:
+                value = stack.pop()
+            parent = stack[-1]
+            if isinstance(parent, dict):
+                parent[keys.pop()] = value
+            else:
+                parent.append(value)
+    return stack[0][0]
+
+
+def test_events_rebuild_document_across_chunk_boundaries():
+    document = {
+        "runs": [{"tool": {"driver": {"name": "Semgrep é\"\\"}}, "results": [{"level": "error"}]}],
+        "numbers": [0, -12, 3.5, 1e-7, -2.5E+3, True, False, None],
+        "nested": [[], {}, [[{"a": ""}]]],
+    }
+    text = json.dumps(document, indent=2)
+
+    for chunk_size in (1, 2, 3, 7, 4096):
+        assert _rebuild(iter_json_events(io.StringIO(text).read, chunk_size)) == document
+
+
+@pytest.mark.parametrize(
+    "text",
+    ['{"a": 1,}', "[1 2]", '{"a" 1}', "01", "[", '{"a": 1} x', "nul", "1.", '"unterminated', "﻿{}"],
+)
+def test_malformed_documents_raise(text):
+    with pytest.raises(JSONStreamError):
+        list(iter_json_events(io.StringIO(text).read, 1))
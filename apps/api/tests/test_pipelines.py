@@ -1,3 +1,6 @@
+import sqlite3
+import threading
+import time
 from pathlib import Path
 from uuid import uuid4
 
@@ -22,6 +25,17 @@ def client():
     return app.test_client()
 
 
+def _sync(client, query="", headers=None):
+    resp = client.post(f"/api/pipelines/sync{query}", headers=headers or {"X-Sync-Token": "test-sync-token"})
+    assert resp.status_code == 202
+    job_id = resp.get_json()["job_id"]
+    job = client.application.extensions["service_container"].sync_jobs.get(job_id)
+    assert job.wait(10)
+    status = client.get(f"/api/pipelines/sync/{job_id}", headers={"X-Sync-Token": "test-sync-token"})
+    assert status.status_code == 200
+    return status.get_json()
+
+
 def test_empty_runs(client):
     resp = client.get("/api/pipelines/runs")
     assert resp.status_code == 200
@@ -93,7 +107,7 @@ def test_sync_then_summary(client, monkeypatch):
         },
     ]
 
-    monkeypatch.setattr(GithubService, "list_workflow_runs", lambda self, per_page=30: fake_runs)
+    monkeypatch.setattr(GithubService, "list_workflow_runs_page", lambda self, **kwargs: (fake_runs, False))
     monkeypatch.setattr(
         GithubService,
         "build_run_summary",
@@ -109,9 +123,10 @@ def test_sync_then_summary(client, monkeypatch):
             },
         },
     )
-    sync_resp = client.post("/api/pipelines/sync", headers={"X-Sync-Token": "test-sync-token"})
-    assert sync_resp.status_code == 200
-    assert sync_resp.get_json()["synced_runs"] == 3
+    sync_job = _sync(client)
+    assert sync_job["status"] == "succeeded"
+    assert sync_job["result"]["synced_runs"] == 3
+    assert sync_job["result"]["inserted"] == 3
 
     runs_resp = client.get("/api/pipelines/runs")
     assert runs_resp.status_code == 200
@@ -120,7 +135,17 @@ def test_sync_then_summary(client, monkeypatch):
     assert runs_resp.get_json()["page"] == 1
     assert runs_resp.get_json()["total_pages"] == 1
     assert runs_resp.get_json()["filters"] == {"category": "", "branch": ""}
-    assert runs_resp.get_json()["items"][0]["summary_json"]["tools"]["trivy"]["high"] == 1
+    assert "summary_json" not in runs_resp.get_json()["items"][0]
+
+    projected = client.get("/api/pipelines/runs?fields=id,conclusion,summary_json").get_json()["items"]
+    assert set(projected[0]) == {"id", "conclusion", "summary_json"}
+    assert projected[0]["summary_json"]["tools"]["trivy"]["high"] == 1
+    assert client.get("/api/pipelines/runs?fields=id,secret").status_code == 400
+
+    run_resp = client.get("/api/pipelines/runs/102")
+    assert run_resp.status_code == 200
+    assert run_resp.get_json()["summary_json"]["tools"]["trivy"]["high"] == 1
+    assert client.get("/api/pipelines/runs/999").status_code == 404
 
     filtered_category = client.get("/api/pipelines/runs?category=cd")
     filtered_category_payload = filtered_category.get_json()
@@ -140,7 +165,7 @@ def test_sync_then_summary(client, monkeypatch):
     assert paged_payload["total"] == 3
     assert paged_payload["page"] == 2
     assert paged_payload["total_pages"] == 2
-    assert paged_payload["items"][0]["id"] == 103
+    assert paged_payload["items"][0]["id"] == 101
 
     summary_resp = client.get("/api/pipelines/summary")
     payload = summary_resp.get_json()
@@ -166,6 +191,45 @@ def test_sync_then_summary(client, monkeypatch):
     assert trend_payload["points"][-1]["total_findings"] == 3
 
 
+def test_summary_counts_runs_with_skipped_artifacts(client, monkeypatch):
+    from app.services.github_service import GithubService
+
+    runs = [{"id": run_id, "name": "Security Scan", "conclusion": "success"} for run_id in (301, 302)]
+    summaries = {301: {"skipped": ["zap-scan"]}, 302: {"tools": {"trivy": {"high": 1}}}}
+    monkeypatch.setattr(GithubService, "list_workflow_runs_page", lambda self, **kwargs: (runs, False))
+    monkeypatch.setattr(GithubService, "build_run_summary", lambda self, run_id: summaries[run_id])
+    _sync(client)
+
+    assert client.get("/api/pipelines/summary").get_json()["security_summary"]["skipped_artifact_runs"] == 1
+    assert client.get("/api/pipelines/runs/301").get_json()["summary_json"]["skipped"] == ["zap-scan"]
+    repository = client.application.extensions["service_container"].pipeline_service.repository
+    with repository._connect() as conn:
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM workflow_runs "
+            "WHERE json_type(summary_json, '$.skipped') IS NOT NULL"
+        ).fetchall()
+    assert "idx_workflow_runs_skipped_artifacts" in " ".join(row["detail"] for row in plan)
+
+
+def test_sync_counts_active_runs_from_partial_index(client, monkeypatch):
+    from app.services.github_service import GithubService
+
+    statuses = {401: "in_progress", 402: "queued", 403: "success"}
+    runs = [{"id": run_id, "name": "CI Pipeline", "conclusion": status} for run_id, status in statuses.items()]
+    monkeypatch.setattr(GithubService, "list_workflow_runs_page", lambda self, **kwargs: (runs, False))
+    monkeypatch.setattr(GithubService, "build_run_summary", lambda self, run_id: {})
+
+    _sync(client)
+    repository = client.application.extensions["service_container"].pipeline_service.repository
+    assert repository.count_active_runs() == 2
+    with repository._connect() as conn:
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM workflow_runs "
+            "WHERE conclusion IN ('queued', 'in_progress', 'waiting', 'requested', 'pending')"
+        ).fetchall()
+    assert "idx_workflow_runs_active" in " ".join(row["detail"] for row in plan)
+
+
 def test_deployment_uses_latest_cd_by_timestamp(client, monkeypatch):
     from app.services.github_service import GithubService
 
@@ -192,10 +256,9 @@ def test_deployment_uses_latest_cd_by_timestamp(client, monkeypatch):
         },
     ]
 
-    monkeypatch.setattr(GithubService, "list_workflow_runs", lambda self, per_page=30: fake_runs)
+    monkeypatch.setattr(GithubService, "list_workflow_runs_page", lambda self, **kwargs: (fake_runs, False))
     monkeypatch.setattr(GithubService, "build_run_summary", lambda self, run_id: {})
-    sync_resp = client.post("/api/pipelines/sync", headers={"X-Sync-Token": "test-sync-token"})
-    assert sync_resp.status_code == 200
+    assert _sync(client)["status"] == "succeeded"
 
     deployment_resp = client.get("/api/pipelines/deployment")
     deployment_payload = deployment_resp.get_json()
@@ -213,26 +276,20 @@ def test_sync_per_page_is_clamped(client, monkeypatch):
 
     captured = []
 
-    def _fake_list_runs(self, per_page=30):
+    def _fake_list_runs(self, per_page=30, page=1, created_since=""):
         captured.append(per_page)
-        return []
+        return [], False
 
-    monkeypatch.setattr(GithubService, "list_workflow_runs", _fake_list_runs)
+    monkeypatch.setattr(GithubService, "list_workflow_runs_page", _fake_list_runs)
     monkeypatch.setattr(GithubService, "build_run_summary", lambda self, run_id: {})
 
-    high_resp = client.post(
-        "/api/pipelines/sync?per_page=9999",
-        headers={"X-Sync-Token": "test-sync-token"},
-    )
-    assert high_resp.status_code == 200
-    assert high_resp.get_json()["synced_runs"] == 0
+    high_job = _sync(client, "?per_page=9999")
+    assert high_job["per_page"] == 100
+    assert high_job["result"]["synced_runs"] == 0
 
-    low_resp = client.post(
-        "/api/pipelines/sync?per_page=-5",
-        headers={"X-Sync-Token": "test-sync-token"},
-    )
-    assert low_resp.status_code == 200
-    assert low_resp.get_json()["synced_runs"] == 0
+    low_job = _sync(client, "?per_page=-5")
+    assert low_job["per_page"] == 1
+    assert low_job["result"]["synced_runs"] == 0
 
     assert captured == [100, 1]
 
@@ -253,3 +310,655 @@ def test_legacy_json_is_migrated_once():
     runs = repo.list_runs()
     assert len(runs) == 1
     assert runs[0]["id"] == 1
+
+
+def test_json_array_items_need_exactly_one_comma():
+    import io
+
+    from app.repositories.run_stream import iter_json_array
+
+    assert list(iter_json_array(io.StringIO(' [ {"id": 1} , 2,\n[3] ] '), chunk_size=3)) == [{"id": 1}, 2, [3]]
+    assert list(iter_json_array(io.StringIO("[ ]"))) == []
+    for malformed in ('[{"id":1} {"id":2}]', '[,,{"id":1}]', '[{"id":1},,{"id":2}]', '[{"id":1},]', "[1"):
+        with pytest.raises(ValueError):
+            list(iter_json_array(io.StringIO(malformed), chunk_size=4))
+
+
+def test_repository_filters_and_paginates_in_sql():
+    from app.repositories.workflow_run_repository import WorkflowRunRepository
+
+    db_path = Path(f"apps/api/tests/.testdata/runs-{uuid4().hex}.db")
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    repo = WorkflowRunRepository(str(db_path))
+    repo.upsert_runs(
+        [
+            {"id": idx, "category": "ci" if idx % 2 else "cd", "branch": "Main" if idx < 6 else "dev"}
+            for idx in range(1, 11)
+        ]
+    )
+
+    assert repo.count_runs() == 10
+    assert repo.count_runs(category="ci") == 5
+    assert repo.count_runs(branch="main") == 5
+    assert repo.count_runs(category="ci", branch="main") == 3
+
+    page = repo.list_runs(category="ci", limit=2, offset=2)
+    assert [run["id"] for run in page] == [5, 3]
+    assert [run["id"] for run in repo.list_runs(branch="MAIN", limit=10)] == [5, 4, 3, 2, 1]
+
+
+def test_upserts_assign_seq_in_first_seen_order(tmp_path):
+    from app.repositories.workflow_run_repository import WorkflowRunRepository
+
+    repo = WorkflowRunRepository(str(tmp_path / "seq.db"))
+    repo.upsert_runs([{"id": 30}, {"id": 10}])
+    repo.upsert_runs([{"id": 10, "conclusion": "success"}, {"id": 20}, {"id": 20}])
+    repo.import_runs(({"id": run_id} for run_id in (40, 30, 50)), batch_size=2)
+
+    with repo._connect() as conn:
+        rows = conn.execute("SELECT run_id, seq FROM workflow_runs ORDER BY seq").fetchall()
+    assert [(row["run_id"], row["seq"]) for row in rows] == [(30, 0), (10, 1), (20, 2), (40, 3), (50, 4)]
+
+
+def test_pipeline_service_is_built_once_per_app(client):
+    container = client.application.extensions["service_container"]
+    assert not container.started
+
+    client.get("/api/pipelines/runs")
+    service = container.pipeline_service
+    client.get("/api/pipelines/summary")
+    assert container.pipeline_service is service
+
+    container.shutdown()
+    assert not container.started
+
+
+def test_sync_upserts_and_keeps_history(client, monkeypatch):
+    from app.services.github_service import GithubService
+
+    def _run(run_id, conclusion, started_at):
+        return {
+            "id": run_id,
+            "name": "CI Pipeline",
+            "conclusion": conclusion,
+            "head_branch": "main",
+            "head_sha": f"sha{run_id}",
+            "run_started_at": started_at,
+            "updated_at": started_at,
+            "html_url": f"https://github.com/example/repo/actions/runs/{run_id}",
+        }
+
+    batches = [
+        [_run(302, "in_progress", "2026-02-16T10:00:00Z"), _run(301, "success", "2026-02-15T10:00:00Z")],
+        [_run(303, "success", "2026-02-17T10:00:00Z"), _run(302, "success", "2026-02-16T10:00:00Z")],
+        [_run(303, "success", "2026-02-17T10:00:00Z")],
+    ]
+    summarized = []
+    monkeypatch.setattr(GithubService, "list_workflow_runs_page", lambda self, **kwargs: (batches.pop(0), False))
+    monkeypatch.setattr(GithubService, "build_run_summary", lambda self, run_id: summarized.append(run_id) or {})
+
+    first = _sync(client)["result"]
+    assert (first["inserted"], first["updated"], first["unchanged"]) == (2, 0, 0)
+
+    second = _sync(client)["result"]
+    assert (second["inserted"], second["updated"], second["unchanged"]) == (1, 1, 0)
+
+    third = _sync(client)["result"]
+    assert (third["inserted"], third["updated"], third["unchanged"]) == (0, 0, 1)
+    # Completed runs that did not change since the last sync are not re-summarized.
+    assert sorted(summarized) == [301, 302, 302, 303]
+    assert third["summarized_runs"] == 0
+
+    items = client.get("/api/pipelines/runs").get_json()["items"]
+    assert [item["id"] for item in items] == [303, 302, 301]
+    assert items[1]["conclusion"] == "success"
+
+
+def test_repository_reads_do_not_block_on_open_write():
+    import threading
+
+    from app.repositories.workflow_run_repository import WorkflowRunRepository
+
+    db_path = Path(f"apps/api/tests/.testdata/runs-{uuid4().hex}.db")
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    repo = WorkflowRunRepository(str(db_path))
+    repo.upsert_runs([{"id": 1}])
+
+    with repo.connections.connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        with repo.connections.connection() as same_thread_conn:
+            assert same_thread_conn is conn
+
+    writer_ready = threading.Event()
+    release_writer = threading.Event()
+
+    def _hold_write_transaction():
+        with repo.connections.connection() as conn:
+            conn.execute("UPDATE workflow_runs SET conclusion = 'failure' WHERE run_id = 1")
+            writer_ready.set()
+            release_writer.wait(5)
+
+    writer = threading.Thread(target=_hold_write_transaction)
+    writer.start()
+    assert writer_ready.wait(5)
+    try:
+        assert repo.count_runs() == 1
+        assert repo.list_runs()[0]["conclusion"] == "unknown"
+    finally:
+        release_writer.set()
+        writer.join()
+
+    assert repo.list_runs()[0]["conclusion"] == "failure"
+    repo.close()
+    assert repo.count_runs() == 1
+
+
+def test_short_lived_threads_do_not_leak_sqlite_connections(tmp_path):
+    from app.repositories.sqlite_connection import SQLiteConnectionManager
+
+    connections = SQLiteConnectionManager(tmp_path / "pool.db", pool_size=2)
+    opened = []
+    open_connection = connections._open
+
+    def _tracking_open():
+        conn = open_connection()
+        opened.append(conn)
+        return conn
+
+    connections._open = _tracking_open
+    barrier = threading.Barrier(4)
+
+    def _query():
+        with connections.connection() as conn:
+            barrier.wait(5)
+            conn.execute("SELECT 1").fetchone()
+
+    for _ in range(5):
+        threads = [threading.Thread(target=_query) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    still_open = []
+    for conn in opened:
+        try:
+            conn.execute("SELECT 1")
+        except sqlite3.ProgrammingError:
+            continue
+        still_open.append(conn)
+    assert len(still_open) == 2
+    assert len(opened) < 20
+
+    connections.close()
+    with connections.connection() as conn:
+        assert conn not in still_open
+
+
+def test_findings_are_backfilled_for_existing_runs():
+    import sqlite3
+
+    from app.repositories.workflow_run_repository import WorkflowRunRepository
+
+    db_path = Path(f"apps/api/tests/.testdata/runs-{uuid4().hex}.db")
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            """
+            CREATE TABLE workflow_runs (
+                run_id INTEGER PRIMARY KEY, seq INTEGER NOT NULL, workflow_name TEXT NOT NULL,
+                category TEXT NOT NULL, conclusion TEXT NOT NULL, branch TEXT NOT NULL,
+                commit_sha TEXT NOT NULL, started_at TEXT NOT NULL, completed_at TEXT NOT NULL,
+                duration INTEGER, html_url TEXT NOT NULL, summary_json TEXT NOT NULL, synced_at TEXT NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            "INSERT INTO workflow_runs VALUES (1, 0, 'Security', 'security', 'success', 'main', 'a', "
+            "'2026-02-15T10:00:00Z', '', NULL, '', ?, '')",
+            (
+                '{"tools": {"trivy": {"high": 2, "low": 1}, "custom": {"high": 4}}, '
+                '"supply_chain": {"sbom_generated": true, "cosign_signed": false, "image_tag": "v1"}}',
+            ),
+        )
+    conn.close()
+
+    repo = WorkflowRunRepository(str(db_path))
+    totals = repo.finding_totals(tools=("trivy",), severities=("high", "low"))
+    assert sorted(totals) == [("trivy", "high", 2), ("trivy", "low", 1)]
+    rollup = repo.daily_security_rollup("2026-02-01", "2026-02-28", severities=("high", "low"))
+    assert sorted(rollup) == [("2026-02-15", "high", 6), ("2026-02-15", "low", 1)]
+    assert repo.latest_run_day().isoformat() == "2026-02-15"
+    flags = ("sbom_generated", "cosign_signed", "image_tag")
+    assert repo.supply_chain_flags(flags) == {"sbom_generated": True, "cosign_signed": False, "image_tag": False}
+
+    summary_json = {"tools": {"trivy": {"critical": 1}}, "supply_chain": {"cosign_signed": True}}
+    repo.upsert_runs([{"id": 1, "started_at": "2026-02-16T09:00:00Z", "summary_json": summary_json}])
+    assert repo.finding_totals(tools=("trivy",), severities=("critical", "high")) == [("trivy", "critical", 1)]
+    rollup = repo.daily_security_rollup("2026-02-01", "2026-02-28", severities=("critical", "high", "low"))
+    assert rollup == [("2026-02-16", "critical", 1)]
+    assert repo.supply_chain_flags(flags) == {"sbom_generated": False, "cosign_signed": True, "image_tag": False}
+    with repo._connect() as conn:
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT 1 FROM run_supply_chain_flags WHERE flag = ? LIMIT 1", ("cosign_signed",)
+        ).fetchall()
+    assert "workflow_runs" not in " ".join(row["detail"] for row in plan)
+    assert "SEARCH" in " ".join(row["detail"] for row in plan)
+
+
+def test_workflow_run_parses_timestamps_once():
+    from datetime import date
+
+    from app.models.workflow_run import WorkflowRun
+
+    run = WorkflowRun.from_github_run(
+        {
+            "id": 1,
+            "run_started_at": "2026-02-15T10:00:00Z",
+            "updated_at": "2026-02-15T10:02:00Z",
+        }
+    )
+    assert run.started_epoch == 1771149600
+    assert run.completed_epoch == run.started_epoch + 120
+    assert run.run_epoch == run.started_epoch
+    assert run.run_day == date(2026, 2, 15).toordinal()
+    assert run.synced_epoch is not None
+
+
+def test_run_params_reuse_parsed_epochs(monkeypatch):
+    from app.models.workflow_run import WorkflowRun
+    from app.repositories import workflow_run_repository
+
+    parsed = WorkflowRun.from_github_run({"id": 1, "run_started_at": "2026-02-15T10:00:00Z"}).to_dict()
+    calls = []
+    real_derive = workflow_run_repository.derive_run_timestamps
+    monkeypatch.setattr(
+        workflow_run_repository,
+        "derive_run_timestamps",
+        lambda *args: calls.append(args) or real_derive(*args),
+    )
+
+    params = workflow_run_repository._run_params(parsed)
+    assert calls == []
+    assert params[-5:] == (1771149600, None, parsed["synced_epoch"], 1771149600, parsed["run_day"])
+
+    legacy = {key: value for key, value in parsed.items() if key not in ("run_epoch", "run_day")}
+    assert workflow_run_repository._run_params({**legacy, "started_epoch": "x"})[-5:] == params[-5:]
+    assert len(calls) == 1
+
+
+def test_migrations_record_version_and_skip_ddl_when_current():
+    from app.repositories.migrations import LATEST_SCHEMA_VERSION
+    from app.repositories.workflow_run_repository import WorkflowRunRepository
+
+    db_path = Path(f"apps/api/tests/.testdata/runs-{uuid4().hex}.db")
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    repo = WorkflowRunRepository(str(db_path))
+    assert repo.schema_version() == LATEST_SCHEMA_VERSION
+
+    statements = []
+    with repo.connections.connection() as conn:
+        conn.set_trace_callback(statements.append)
+    try:
+        assert repo.migrate() == LATEST_SCHEMA_VERSION
+    finally:
+        with repo.connections.connection() as conn:
+            conn.set_trace_callback(None)
+    assert statements == ["PRAGMA user_version"]
+
+
+def test_ndjson_export_import_round_trip(client):
+    import json
+
+    headers = {"X-Sync-Token": "test-sync-token"}
+    lines = [
+        json.dumps({"id": 11, "category": "ci", "started_at": "2026-02-15T10:00:00Z"}),
+        "not json",
+        "",
+        json.dumps({"id": 12, "category": "security", "summary_json": {"tools": {"trivy": {"high": 2}}}}),
+        json.dumps({"workflow_name": "missing id"}),
+    ]
+    assert client.post("/api/pipelines/import", data="\n".join(lines)).status_code == 401
+
+    resp = client.post("/api/pipelines/import", data="\n".join(lines), headers=headers)
+    assert resp.status_code == 200
+    assert resp.get_json() == {"inserted": 2, "updated": 0, "unchanged": 0, "skipped": 2}
+
+    export_resp = client.get("/api/pipelines/export", headers=headers)
+    assert export_resp.status_code == 200
+    assert export_resp.mimetype == "application/x-ndjson"
+    exported = [json.loads(line) for line in export_resp.get_data(as_text=True).splitlines()]
+    assert [run["id"] for run in exported] == [11, 12]
+    assert exported[1]["summary_json"]["tools"]["trivy"]["high"] == 2
+
+    replay = client.post("/api/pipelines/import", data=export_resp.get_data(), headers=headers)
+    assert replay.get_json()["unchanged"] == 2
+
+
+def test_import_skips_rows_the_columns_cannot_hold(client):
+    import json
+
+    headers = {"X-Sync-Token": "test-sync-token"}
+    lines = [
+        json.dumps({"id": 21, "workflow_name": "CI", "duration": 12.0}),
+        json.dumps({"id": 22, "workflow_name": None, "branch": None, "summary_json": None}),
+        json.dumps({"id": 23, "workflow_name": ["CI"]}),
+        json.dumps({"id": 24, "summary_json": "not a dict"}),
+        json.dumps({"id": 25, "duration": "12"}),
+        json.dumps({"id": True}),
+        json.dumps({"id": 2**63}),
+        json.dumps({"id": 27, "duration": 1e300}),
+        json.dumps({"id": 28, "duration": -(2**63) - 1}),
+        json.dumps({"id": 26, "workflow_name": "Security"}),
+    ]
+
+    resp = client.post("/api/pipelines/import", data="\n".join(lines), headers=headers)
+    assert resp.status_code == 200
+    assert resp.get_json() == {"inserted": 3, "updated": 0, "unchanged": 0, "skipped": 7}
+    repository = client.application.extensions["service_container"].pipeline_service.repository
+    runs = repository.get_runs([21, 22, 26])
+    assert runs[21]["duration"] == 12
+    assert (runs[22]["workflow_name"], runs[22]["branch"], runs[22]["summary_json"]) == ("unknown", "", {})
+    assert runs[26]["workflow_name"] == "Security"
+
+
+def test_sync_short_circuits_when_runs_not_modified(client, monkeypatch):
+    from app.services.github_service import GithubNotModified, GithubService
+
+    def _not_modified(self, **kwargs):
+        raise GithubNotModified("not modified")
+
+    monkeypatch.setattr(GithubService, "list_workflow_runs_page", _not_modified)
+    payload = _sync(client)["result"]
+    assert payload["not_modified"] is True
+    assert payload["synced_runs"] == 0
+
+    cache = client.application.extensions["service_container"].pipeline_service.github.validator_cache
+    cache.put("https://api.github.test/x", '"abc"', "", '{"ok": true}')
+    assert cache.get("https://api.github.test/x")["etag"] == '"abc"'
+
+
+def test_incremental_sync_follows_pages_and_resumes_from_cursor(client, monkeypatch):
+    from app.services.github_service import GithubService
+
+    def _run(run_id, created_at, conclusion="success"):
+        return {
+            "id": run_id,
+            "name": "CI Pipeline",
+            "conclusion": conclusion,
+            "head_branch": "main",
+            "created_at": created_at,
+            "run_started_at": created_at,
+            "updated_at": created_at,
+        }
+
+    pages = {
+        ("", 1): [_run(5, "2026-03-05T00:00:00Z"), _run(4, "2026-03-04T00:00:00Z", None)],
+        ("2026-03-04T00:00:00Z", 1): [_run(7, "2026-03-07T00:00:00Z"), _run(6, "2026-03-06T00:00:00Z")],
+        ("2026-03-04T00:00:00Z", 2): [_run(4, "2026-03-04T00:00:00Z")],
+    }
+    calls = []
+
+    def _fake_page(self, per_page=30, page=1, created_since=""):
+        calls.append((created_since, page))
+        return pages[(created_since, page)], page == 1 and bool(created_since)
+
+    monkeypatch.setattr(GithubService, "list_workflow_runs_page", _fake_page)
+    monkeypatch.setattr(GithubService, "build_run_summary", lambda self, run_id: {})
+    headers = {"X-Sync-Token": "test-sync-token"}
+
+    first = _sync(client, headers=headers)["result"]
+    assert (first["inserted"], first["pages"]) == (2, 1)
+    # Run 4 was still in progress, so the next cycle starts from its created_at and walks both pages.
+    second = _sync(client, headers=headers)["result"]
+    assert (second["inserted"], second["updated"], second["pages"]) == (2, 1, 2)
+    assert calls == [("", 1), ("2026-03-04T00:00:00Z", 1), ("2026-03-04T00:00:00Z", 2)]
+    repository = client.application.extensions["service_container"].pipeline_service.repository
+    assert repository.get_sync_state("runs_created_cursor") == "2026-03-07T00:00:00Z"
+
+
+def test_backfill_sync_is_resumable(client, monkeypatch):
+    from app.services.github_service import GithubService
+
+    def _fake_page(self, per_page=30, page=1, created_since=""):
+        run = {"id": page, "name": "CI Pipeline", "conclusion": "success", "created_at": "2026-03-01T00:00:00Z"}
+        return [run], page < 3
+
+    monkeypatch.setattr(GithubService, "list_workflow_runs_page", _fake_page)
+    monkeypatch.setattr(GithubService, "build_run_summary", lambda self, run_id: {})
+    service = client.application.extensions["service_container"].pipeline_service
+    service.max_pages = 2
+    headers = {"X-Sync-Token": "test-sync-token"}
+
+    first = _sync(client, "?mode=backfill", headers=headers)["result"]
+    assert (first["pages"], first["backfill_complete"]) == (2, False)
+    second = _sync(client, "?mode=backfill", headers=headers)["result"]
+    assert (second["pages"], second["inserted"], second["backfill_complete"]) == (1, 1, True)
+    assert service.repository.get_sync_state("runs_backfill_page") is None
+    assert client.post("/api/pipelines/sync?mode=bogus", headers=headers).status_code == 400
+
+
+def test_pending_summaries_are_resumed_when_listing_is_unchanged(client, monkeypatch):
+    from app.services.github_service import GithubNotModified, GithubService
+
+    run = {
+        "id": 900,
+        "name": "CI Pipeline",
+        "conclusion": "success",
+        "created_at": "2026-03-01T00:00:00Z",
+        "run_started_at": "2026-03-01T00:00:00Z",
+        "updated_at": "2026-03-01T00:10:00Z",
+    }
+    listings = [([run], False)]
+
+    def _fake_page(self, **kwargs):
+        if not listings:
+            raise GithubNotModified("not modified")
+        return listings.pop(0)
+
+    summaries = [{"status": "pending"}, {"tools": {"trivy": {"high": 2}}}]
+    monkeypatch.setattr(GithubService, "list_workflow_runs_page", _fake_page)
+    monkeypatch.setattr(GithubService, "build_run_summary", lambda self, run_id: summaries.pop(0))
+    headers = {"X-Sync-Token": "test-sync-token"}
+
+    first = _sync(client, headers=headers)["result"]
+    assert (first["summarized_runs"], first["pending_summaries"]) == (0, 1)
+    assert "remaining" in first["rate_limit"]
+
+    second = _sync(client, headers=headers)["result"]
+    assert (second["summarized_runs"], second["updated"], second["pending_summaries"]) == (1, 1, 0)
+    assert client.get("/api/pipelines/runs/900").get_json()["summary_json"]["tools"]["trivy"]["high"] == 2
+
+    repository = client.application.extensions["service_container"].pipeline_service.repository
+    with repository._connect() as conn:
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT run_id FROM workflow_runs "
+            "WHERE json_extract(summary_json, '$.status') = 'pending' ORDER BY run_id DESC LIMIT 5"
+        ).fetchall()
+    assert "idx_workflow_runs_pending_summary" in " ".join(row["detail"] for row in plan)
+
+
+def test_sync_jobs_coalesce_and_report_failures(client, monkeypatch):
+    from app.services.github_service import GithubService, GithubServiceError
+
+    release = threading.Event()
+
+    def _slow_page(self, **kwargs):
+        release.wait(10)
+        raise GithubServiceError("GitHub unavailable")
+
+    monkeypatch.setattr(GithubService, "list_workflow_runs_page", _slow_page)
+    headers = {"X-Sync-Token": "test-sync-token"}
+
+    first = client.post("/api/pipelines/sync", headers=headers)
+    second = client.post("/api/pipelines/sync", headers=headers)
+    assert (first.status_code, second.status_code) == (202, 202)
+    assert first.get_json()["job_id"] == second.get_json()["job_id"]
+    assert second.get_json()["coalesced"] is True
+    wider = client.post("/api/pipelines/sync?per_page=100", headers=headers)
+    assert wider.get_json()["job_id"] != first.get_json()["job_id"]
+    assert (wider.get_json()["coalesced"], wider.get_json()["per_page"]) == (False, 100)
+    assert first.headers["Location"].endswith(f"/api/pipelines/sync/{first.get_json()['job_id']}")
+
+    release.set()
+    job = client.application.extensions["service_container"].sync_jobs.get(first.get_json()["job_id"])
+    assert job.wait(10)
+    status = client.get(f"/api/pipelines/sync/{job.id}?debug=1", headers=headers).get_json()
+    assert (status["status"], status["error"]) == ("failed", "GitHub unavailable")
+    assert status["detail"].startswith("GithubServiceError")
+    assert client.get("/api/pipelines/sync/unknown", headers=headers).status_code == 404
+    assert client.get(f"/api/pipelines/sync/{job.id}").status_code == 401
+
+
+def test_sync_lease_coalesces_syncs_across_runners(tmp_path):
+    from app.repositories.migrations import run_migrations
+    from app.repositories.sqlite_connection import SQLiteConnectionManager
+    from app.repositories.sync_lease import SyncLease
+    from app.services.sync_jobs import SyncJobRunner
+
+    connections = SQLiteConnectionManager(tmp_path / "lease.db")
+    with connections.connection() as conn:
+        run_migrations(conn)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    class _Service:
+        sync_lease = SyncLease(connections, ttl_seconds=30)
+
+        def sync(self, per_page=30, mode="incremental", progress=None):
+            calls.append(mode)
+            started.set()
+            release.wait(10)
+            return {"synced": 4, "inserted": 4, "per_page": per_page}
+
+    # Two runners stand in for two worker processes sharing one database.
+    leader = SyncJobRunner(lambda: _Service(), lease_poll_seconds=0.05)
+    follower = SyncJobRunner(lambda: _Service(), lease_poll_seconds=0.05)
+    try:
+        first, _ = leader.submit()
+        assert started.wait(10)
+        second, _ = follower.submit()
+        time.sleep(0.2)
+        assert second.status == "running"
+        assert second.progress["waiting_for"] == leader.owner
+        release.set()
+        assert first.wait(10) and second.wait(10)
+    finally:
+        leader.shutdown()
+        follower.shutdown()
+        connections.close()
+
+    assert calls == ["incremental"]
+    assert first.result == {"synced": 4, "inserted": 4, "per_page": 30}
+    assert second.result == {"synced": 4, "inserted": 4, "per_page": 30, "shared": True}
+
+
+def test_sync_lease_can_be_taken_over_after_expiry(tmp_path):
+    from app.repositories.migrations import run_migrations
+    from app.repositories.sqlite_connection import SQLiteConnectionManager
+    from app.repositories.sync_lease import SyncLease
+
+    now = [1000.0]
+    connections = SQLiteConnectionManager(tmp_path / "lease.db")
+    with connections.connection() as conn:
+        run_migrations(conn)
+    lease = SyncLease(connections, ttl_seconds=60, clock=lambda: now[0])
+    try:
+        assert lease.try_acquire("worker-a", "incremental")
+        assert not lease.try_acquire("worker-b", "incremental")
+        now[0] += 30
+        assert lease.renew("worker-a")
+        now[0] += 61
+        assert lease.try_acquire("worker-b", "incremental")
+        assert not lease.renew("worker-a")
+        lease.release("worker-b", {"synced": 1})
+        assert lease.state()["generation"] == 1
+        assert lease.state()["result"] == {"synced": 1}
+    finally:
+        connections.close()
+
+
+def test_http_validator_cache_keeps_only_recent_entries(tmp_path):
+    from app.repositories.http_validator_cache import HttpValidatorCache
+    from app.repositories.sqlite_connection import SQLiteConnectionManager
+    from app.repositories.workflow_run_repository import WorkflowRunRepository
+
+    connections = SQLiteConnectionManager(tmp_path / "validators.db")
+    WorkflowRunRepository(str(tmp_path / "validators.db"), connections=connections)
+    cache = HttpValidatorCache(connections, max_entries=3)
+
+    for run_id in range(5):
+        cache.put(f"https://api.github.test/runs/{run_id}/artifacts", f'"etag-{run_id}"', "", "{}")
+    cache.put("https://api.github.test/runs/2/artifacts", '"etag-2b"', "", "{}")
+    cache.put("https://api.github.test/runs/5/artifacts", '"etag-5"', "", "{}")
+
+    kept = [run_id for run_id in range(6) if cache.get(f"https://api.github.test/runs/{run_id}/artifacts")]
+    assert kept == [2, 4, 5]
+    assert cache.get("https://api.github.test/runs/2/artifacts")["etag"] == '"etag-2b"'
+
+
+def test_webhook_upserts_run_and_queues_its_summary(client, monkeypatch):
+    import hashlib
+    import hmac
+    import json
+
+    from app.services.github_service import GithubService
+
+    client.application.config["GITHUB_WEBHOOK_SECRET"] = "hook-secret"
+    summarized = []
+    monkeypatch.setattr(
+        GithubService,
+        "build_run_summary",
+        lambda self, run_id: summarized.append(run_id) or {"tools": {"bandit": {"medium": 3}}},
+    )
+
+    def _deliver(run, event="workflow_run", secret="hook-secret", repository=None):
+        repository = {"full_name": "Example/Repo"} if repository is None else repository
+        body = json.dumps({"action": "completed", "workflow_run": run, "repository": repository})
+        signature = "sha256=" + hmac.new(secret.encode(), body.encode(), hashlib.sha256).hexdigest()
+        return client.post(
+            "/api/pipelines/webhook",
+            data=body,
+            headers={"X-GitHub-Event": event, "X-Hub-Signature-256": signature},
+            content_type="application/json",
+        )
+
+    run = {
+        "id": 4242,
+        "name": "Security Scan",
+        "status": "in_progress",
+        "conclusion": None,
+        "head_branch": "main",
+        "run_started_at": "2026-03-10T10:00:00Z",
+        "updated_at": "2026-03-10T10:00:00Z",
+    }
+    assert _deliver(run, secret="wrong").status_code == 401
+    assert _deliver(run, event="push").status_code == 202
+    assert _deliver(run, repository="example/repo").status_code == 400
+    assert _deliver(run, repository=["example/repo"]).status_code == 400
+    assert _deliver(run, repository={"full_name": "other/repo"}).get_json()["ignored"] is True
+
+    started = _deliver(run)
+    assert started.status_code == 200
+    assert started.get_json()["inserted"] == 1
+    assert started.get_json()["summary_job_id"] is None
+
+    completed = _deliver({**run, "status": "completed", "conclusion": "success", "updated_at": "2026-03-10T10:05:00Z"})
+    assert completed.status_code == 202
+    assert client.get("/api/pipelines/runs/4242").get_json()["summary_json"] in (
+        {"status": "pending"},
+        {"tools": {"bandit": {"medium": 3}}},
+    )
+    job = client.application.extensions["service_container"].sync_jobs.get(completed.get_json()["summary_job_id"])
+    assert job.wait(10) and job.status == "succeeded"
+    assert summarized == [4242]
+    stored = client.get("/api/pipelines/runs/4242").get_json()
+    assert stored["conclusion"] == "success"
+    assert stored["summary_json"]["tools"]["bandit"]["medium"] == 3
+
+
+def test_poller_status_reports_disabled_in_tests(client):
+    resp = client.get("/api/pipelines/poller")
+    assert resp.status_code == 200
+    assert resp.get_json() == {"enabled": False}
@@ -0,0 +1,54 @@
+import random
+
+from app.services.sync_poller import AdaptivePollSchedule, build_poll_schedule
+
+
+def _schedule(**overrides):
+    options = {
+        "base_interval": 300,
+        "fast_interval": 30,
+        "max_interval": 1200,
+        "idle_cycles_before_backoff": 2,
+        "jitter_ratio": 0,
+        "clock": lambda: 1000.0,
+    }
+    options.update(overrides)
+    return AdaptivePollSchedule(**options)
+
+
+def test_schedule_polls_fast_while_runs_are_active_and_backs_off_when_idle():
+    schedule = _schedule()
+
+    assert schedule.record({"inserted": 1, "active_runs": 2}) == 30
+    assert schedule.record({"updated": 1, "active_runs": 0}) == 300
+    assert schedule.record({"unchanged": 5}) == 300
+    assert schedule.record({"not_modified": True}) == 600
+    assert schedule.record(None) == 1200
+    assert schedule.record({"unchanged": 5}) == 1200
+    assert schedule.record({"updated": 1}) == 300
+
+    snapshot = schedule.snapshot()
+    assert snapshot["interval_seconds"] == 300
+    assert snapshot["next_run_at"] == "1970-01-01T00:21:40+00:00"
+
+
+def test_schedule_jitter_stays_within_ratio():
+    schedule = _schedule(jitter_ratio=0.2, rng=random.Random(7))
+    delays = {schedule.record({"updated": 1}) for _ in range(20)}
+
+    assert len(delays) > 1
+    assert all(240 <= delay <= 360 for delay in delays)
+
+
+def test_webhook_schedule_uses_reconcile_interval_and_ignores_active_runs():
+    schedule = build_poll_schedule(
+        {
+            "POLLING_INTERVAL_SECONDS": 300,
+            "GITHUB_WEBHOOK_SECRET": "secret",
+            "POLLING_RECONCILE_INTERVAL_SECONDS": 1800,
+            "POLLING_MAX_INTERVAL_SECONDS": 3600,
+            "POLLING_JITTER_RATIO": 0,
+        }
+    )
+
+    assert schedule.record({"updated": 1, "active_runs": 3}) == 1800
@@ -82,6 +82,8 @@ export default async function HomePage({ searchParams }: HomeProps) {
           <h3>Security Findings Summary</h3>
           <span>
             Secret leak: {securitySummary?.secret_leak_detected ? "detected" : "not detected"}
+            {(securitySummary?.skipped_artifact_runs ?? 0) > 0 &&
+              ` · Incomplete: ${securitySummary?.skipped_artifact_runs} runs with oversized artifacts not parsed`}
           </span>
         </header>
         <div className="security-grid">
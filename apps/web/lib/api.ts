@@ -69,6 +69,7 @@ type SummaryResponse = {
     tool_totals: Record<string, number>;
     tool_severity: Record<string, Record<string, number>>;
     secret_leak_detected: boolean;
+    skipped_artifact_runs: number;
     supply_chain: {
       sbom_generated: boolean;
       cosign_signed: boolean;